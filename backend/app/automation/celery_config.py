@@ -4,10 +4,20 @@ Celery Configuration
 Configuration for async task queue using Redis as broker and backend.
 """
 
+import functools
+import json
 import os
 
 from celery import Celery
 from celery.schedules import crontab
+from kombu.serialization import register
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Redis configuration
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -15,6 +25,27 @@ REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = os.getenv("REDIS_DB", "0")
 REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
+# Entity payloads cross the task/result boundary several times during a
+# fan-out; orjson encodes and decodes them much faster than stdlib json.
+# The same codec is used for the entity payloads and result cache in Redis.
+if ORJSON_AVAILABLE:
+    json_dumps = functools.partial(
+        orjson.dumps, default=str, option=orjson.OPT_NON_STR_KEYS
+    )
+    json_loads = orjson.loads
+    register(
+        "orjson",
+        json_dumps,
+        json_loads,
+        content_type="application/x-orjson",
+        content_encoding="binary",
+    )
+    TASK_SERIALIZER = "orjson"
+else:
+    json_dumps = functools.partial(json.dumps, default=str)
+    json_loads = json.loads
+    TASK_SERIALIZER = "json"
+
 # Create Celery app
 celery_app = Celery(
     "reconvault",
@@ -28,9 +59,9 @@ celery_app = Celery(
 # Celery configuration
 celery_app.conf.update(
     # Task settings
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer=TASK_SERIALIZER,
+    accept_content=[TASK_SERIALIZER, "json"],
+    result_serializer=TASK_SERIALIZER,
     timezone="UTC",
     enable_utc=True,
     # Result backend settings
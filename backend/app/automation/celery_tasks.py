@@ -5,14 +5,34 @@ Async tasks for OSINT collection using Celery and Redis.
 """
 
 import asyncio
+import functools
+import hashlib
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-from celery import Task
+from celery import Task, chord
+from celery.signals import worker_process_init, worker_process_shutdown
 from loguru import logger
 
-from app.automation.celery_config import celery_app
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    logger.warning("Redis not available for collector result caching")
+
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+from app.automation.celery_config import (REDIS_URL, celery_app, json_dumps,
+                                          json_loads)
 from app.collectors import (
     CollectorConfig,
     DarkWebCollector,
@@ -25,286 +45,268 @@ from app.collectors import (
     SocialCollector,
     WebCollector,
 )
+from app.collectors.base_collector import close_shared_clients
 
 # Configure Celery logger
 celery_logger = logging.getLogger("celery")
 celery_logger.setLevel(logging.INFO)
 
+# Freshness window (seconds) for cached collector results
+COLLECTOR_CACHE_TTL = {
+    "web": 600,
+    "social": 1800,
+    "domain": 3600,
+    "ip": 3600,
+    "email": 3600,
+    "media": 3600,
+    "darkweb": 900,
+    "geo": 86400,
+}
 
-class AsyncTaskContext:
-    """Context manager for async tasks in Celery"""
+# Lifetime (seconds) of offloaded entity payloads. The cached result holding
+# a payload's handle is written after the payload, so the payload must outlive
+# the longest cache TTL; the margin also leaves the chord callback time to
+# read payloads of results that were never cached
+ENTITY_PAYLOAD_TTL = max(COLLECTOR_CACHE_TTL.values()) + 3600
 
-    def __enter__(self):
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
-        return self.loop
+_result_cache = None
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.loop.close()
+
+def _get_result_cache():
+    """Get (lazily created) Redis client for collector result caching"""
+    global _result_cache
+
+    if _result_cache is None and REDIS_AVAILABLE:
+        try:
+            _result_cache = redis.Redis.from_url(REDIS_URL)
+        except Exception as e:
+            logger.warning(f"Collector result cache unavailable: {e}")
+
+    return _result_cache
 
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_web_osint")
-def collect_web_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+def _result_cache_key(collector_type: str, target: str) -> str:
+    """Build content-addressed cache key for a collector result"""
+    digest = hashlib.sha256(f"{collector_type}|{target}".encode()).hexdigest()
+    return f"reconvault:collector:{digest}"
+
+
+def _offload_entities(result: Dict[str, Any], ref: str) -> Dict[str, Any]:
     """
-    Queue web OSINT collection task.
+    Move the entity payload of a collector result to Redis, leaving a handle.
 
     Args:
-        target: Target URL or domain
-        task_id: Task ID for tracking
+        result: Collector task result
+        ref: Redis key to store the entities under
 
     Returns:
-        Collection result
+        Result with "data" replaced by "entities_ref"/"entities_count",
+        or the unchanged result if Redis is unavailable
     """
-    logger.info(f"Web OSINT task started for {target} (task_id: {task_id})")
+    cache = _get_result_cache()
+    if cache is None or not result.get("data"):
+        return result
 
     try:
-        with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.URL)
-            collector = WebCollector(config)
+        cache.set(ref, json_dumps(result["data"]), ex=ENTITY_PAYLOAD_TTL)
+    except Exception as e:
+        logger.warning(f"Entity offload failed, returning entities inline: {e}")
+        return result
 
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
+    offloaded = {k: v for k, v in result.items() if k != "data"}
+    offloaded["entities_ref"] = ref
+    offloaded["entities_count"] = len(result["data"])
+    return offloaded
 
-            result = loop.run_until_complete(run_collector())
 
-            logger.info(f"Web OSINT task completed for {target}: {result.success}")
-            return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
-            }
+def _load_entities(results: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Resolve "entities_ref" handles of collector results back into "data".
 
-    except Exception as e:
-        logger.exception(f"Web OSINT task failed for {target}: {e}")
-        return {
-            "success": False,
-            "errors": [str(e)],
-            "risk_level": "INFO",
-            "collection_time": 0,
-        }
+    Payloads are fetched with a single MGET but decoded lazily, one result
+    at a time, so callers can merge and drop each collector's entities
+    before the next one is materialized.
 
+    Args:
+        results: Collector task results
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_social_osint")
-def collect_social_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+    Yields:
+        Results with entity payloads inlined
     """
-    Queue social media OSINT collection task.
+    refs = [r["entities_ref"] for r in results if "entities_ref" in r]
+    cache = _get_result_cache() if refs else None
+    payloads = dict(zip(refs, cache.mget(refs) if cache is not None else [None] * len(refs)))
+
+    for result in results:
+        ref = result.get("entities_ref")
+        if ref is not None:
+            payload = payloads.pop(ref, None)
+            if not payload:
+                logger.warning(f"Entity payload {ref} expired or missing")
+            result = {**result, "data": json_loads(payload) if payload else []}
+            del payload
+        yield result
+
+
+def cached_result(collector_type: str) -> Callable:
+    """
+    Cache successful collector task results in Redis.
+
+    Identical (collector_type, target) invocations within the collector's
+    freshness window are served from the cache without running the collector.
 
     Args:
-        target: Target username or social URL
-        task_id: Task ID for tracking
+        collector_type: Collector type (key into COLLECTOR_CACHE_TTL)
 
     Returns:
-        Collection result
+        Task function decorator
     """
-    logger.info(f"Social OSINT task started for {target} (task_id: {task_id})")
+    ttl = COLLECTOR_CACHE_TTL[collector_type]
 
-    try:
-        with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.USERNAME)
-            collector = SocialCollector(config)
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+            cache = _get_result_cache()
+            key = _result_cache_key(collector_type, target)
 
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
+            if cache is not None:
+                try:
+                    cached = cache.get(key)
+                    if cached:
+                        logger.info(f"{collector_type} OSINT cache hit for {target} (task_id: {task_id})")
+                        return json_loads(cached)
+                except Exception as e:
+                    logger.warning(f"Cache retrieval failed: {e}")
 
-            result = loop.run_until_complete(run_collector())
+            result = func(self, target, task_id)
 
-            logger.info(f"Social OSINT task completed for {target}: {result.success}")
-            return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
-            }
+            if cache is not None and result.get("success"):
+                try:
+                    cache.setex(key, ttl, json_dumps(result))
+                except Exception as e:
+                    logger.warning(f"Cache write failed: {e}")
 
-    except Exception as e:
-        logger.exception(f"Social OSINT task failed for {target}: {e}")
-        return {
-            "success": False,
-            "errors": [str(e)],
-            "risk_level": "INFO",
-            "collection_time": 0,
-        }
+            return result
 
+        return wrapper
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_domain_osint")
-def collect_domain_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
-    """
-    Queue domain OSINT collection task.
+    return decorator
 
-    Args:
-        target: Target domain
-        task_id: Task ID for tracking
 
-    Returns:
-        Collection result
-    """
-    logger.info(f"Domain OSINT task started for {target} (task_id: {task_id})")
+# Per-process event loop shared by every task in a worker, so the pooled HTTP
+# clients (get_shared_client) and their keep-alive sockets and TLS sessions
+# survive across tasks
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
 
-    try:
-        with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.DOMAIN)
-            collector = DomainCollector(config)
 
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get (lazily created) event loop of this worker process, uvloop if installed"""
+    global _worker_loop
 
-            result = loop.run_until_complete(run_collector())
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
 
-            logger.info(f"Domain OSINT task completed for {target}: {result.success}")
-            return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
-            }
+    asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
 
-    except Exception as e:
-        logger.exception(f"Domain OSINT task failed for {target}: {e}")
-        return {
-            "success": False,
-            "errors": [str(e)],
-            "risk_level": "INFO",
-            "collection_time": 0,
-        }
 
+@worker_process_init.connect
+def _init_worker_process(**kwargs) -> None:
+    """Drop loop state inherited from the parent process"""
+    global _worker_loop
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_ip_osint")
-def collect_ip_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
-    """
-    Queue IP address OSINT collection task.
+    _worker_loop = None
 
-    Args:
-        target: Target IP address
-        task_id: Task ID for tracking
 
-    Returns:
-        Collection result
-    """
-    logger.info(f"IP OSINT task started for {target} (task_id: {task_id})")
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs) -> None:
+    """Close the shared HTTP clients and event loop of this worker process"""
+    if _worker_loop is None or _worker_loop.is_closed():
+        return
 
     try:
-        with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.IP)
-            collector = IPCollector(config)
+        _worker_loop.run_until_complete(close_shared_clients())
+    finally:
+        _worker_loop.close()
+
+
+class AsyncTaskContext:
+    """Context manager for async tasks in Celery"""
 
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
+    def __enter__(self):
+        self.loop = _get_worker_loop()
+        return self.loop
 
-            result = loop.run_until_complete(run_collector())
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # The loop is kept for the lifetime of the worker process
+        pass
 
-            logger.info(f"IP OSINT task completed for {target}: {result.success}")
-            return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
-            }
 
-    except Exception as e:
-        logger.exception(f"IP OSINT task failed for {target}: {e}")
-        return {
-            "success": False,
-            "errors": [str(e)],
-            "risk_level": "INFO",
-            "collection_time": 0,
-        }
+# Collector type -> (collector class, data type, log label, target description)
+_COLLECTORS = {
+    "web": (WebCollector, DataType.URL, "Web", "Target URL or domain"),
+    "social": (SocialCollector, DataType.USERNAME, "Social", "Target username or social URL"),
+    "domain": (DomainCollector, DataType.DOMAIN, "Domain", "Target domain"),
+    "ip": (IPCollector, DataType.IP, "IP", "Target IP address"),
+    "email": (EmailCollector, DataType.EMAIL, "Email", "Target email address"),
+    "media": (MediaCollector, DataType.TEXT, "Media", "Target media URL"),
+    "darkweb": (DarkWebCollector, DataType.TEXT, "Dark web", "Target to search for"),
+    "geo": (GeoCollector, DataType.TEXT, "Geo", "Target (address or coordinates)"),
+}
 
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_email_osint")
-def collect_email_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+def _run_collector(collector_type: str, target: str, task_id: str) -> Dict[str, Any]:
     """
-    Queue email OSINT collection task.
+    Run a single collector to completion and package its result.
 
     Args:
-        target: Target email address
+        collector_type: Collector type (key into _COLLECTORS)
+        target: Target to collect
         task_id: Task ID for tracking
 
     Returns:
         Collection result
     """
-    logger.info(f"Email OSINT task started for {target} (task_id: {task_id})")
-
-    try:
-        with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.EMAIL)
-            collector = EmailCollector(config)
-
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
-
-            result = loop.run_until_complete(run_collector())
-
-            logger.info(f"Email OSINT task completed for {target}: {result.success}")
-            return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
-            }
-
-    except Exception as e:
-        logger.exception(f"Email OSINT task failed for {target}: {e}")
-        return {
-            "success": False,
-            "errors": [str(e)],
-            "risk_level": "INFO",
-            "collection_time": 0,
-        }
+    with AsyncTaskContext() as loop:
+        return loop.run_until_complete(_collect(collector_type, target, task_id))
 
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_media_osint")
-def collect_media_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+async def _collect(collector_type: str, target: str, task_id: str) -> Dict[str, Any]:
     """
-    Queue media OSINT collection task.
+    Run a single collector on the worker loop and package its result.
 
     Args:
-        target: Target media URL
+        collector_type: Collector type (key into _COLLECTORS)
+        target: Target to collect
         task_id: Task ID for tracking
 
     Returns:
         Collection result
     """
-    logger.info(f"Media OSINT task started for {target} (task_id: {task_id})")
+    collector_class, data_type, label, _ = _COLLECTORS[collector_type]
 
-    try:
-        with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.TEXT)
-            collector = MediaCollector(config)
+    logger.info(f"{label} OSINT task started for {target} (task_id: {task_id})")
 
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
+    try:
+        # Collectors take pooled clients from get_shared_client(); dark web
+        # ones pick a Tor client isolated per target
+        config = CollectorConfig(target=target, data_type=data_type)
+        collector = collector_class(config)
 
-            result = loop.run_until_complete(run_collector())
+        async with collector:
+            result = await collector.execute()
 
-            logger.info(f"Media OSINT task completed for {target}: {result.success}")
-            return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
-            }
+        logger.info(f"{label} OSINT task completed for {target}: {result.success}")
+        return {
+            "success": result.success,
+            "data": result.data,
+            "errors": result.errors,
+            "risk_level": result.risk_level.value,
+            "collection_time": result.collection_time,
+        }
 
     except Exception as e:
-        logger.exception(f"Media OSINT task failed for {target}: {e}")
+        logger.exception(f"{label} OSINT task failed for {target}: {e}")
         return {
             "success": False,
             "errors": [str(e)],
@@ -313,147 +315,222 @@ def collect_media_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]
         }
 
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_darkweb_osint")
-def collect_darkweb_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+def _make_collector_task(collector_type: str) -> Task:
     """
-    Queue dark web OSINT collection task.
+    Register the collect_<type>_osint Celery task for a collector type.
 
     Args:
-        target: Target to search for
-        task_id: Task ID for tracking
+        collector_type: Collector type (key into _COLLECTORS)
 
     Returns:
-        Collection result
+        Registered Celery task
     """
-    logger.info(f"Dark web OSINT task started for {target} (task_id: {task_id})")
+    _, _, label, target_description = _COLLECTORS[collector_type]
+    task_name = f"collect_{collector_type}_osint"
 
-    try:
-        with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.TEXT)
-            collector = DarkWebCollector(config)
+    def collect_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+        result = _run_collector(collector_type, target, task_id)
+        if self.request.id:
+            result = _offload_entities(result, f"ent:{self.request.id}")
+        return result
 
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
+    collect_osint.__name__ = collect_osint.__qualname__ = task_name
+    collect_osint.__doc__ = f"""
+    Queue {label} OSINT collection task.
 
-            result = loop.run_until_complete(run_collector())
+    Args:
+        target: {target_description}
+        task_id: Task ID for tracking
 
-            logger.info(f"Dark web OSINT task completed for {target}: {result.success}")
-            return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
-            }
+    Returns:
+        Collection result (entities are stored in Redis and referenced
+        by "entities_ref" when a result backend is reachable)
+    """
 
-    except Exception as e:
-        logger.exception(f"Dark web OSINT task failed for {target}: {e}")
-        return {
-            "success": False,
-            "errors": [str(e)],
-            "risk_level": "INFO",
-            "collection_time": 0,
-        }
+    return celery_app.task(bind=True, name=f"app.automation.celery_tasks.{task_name}")(
+        cached_result(collector_type)(collect_osint)
+    )
+
+
+collect_web_osint = _make_collector_task("web")
+collect_social_osint = _make_collector_task("social")
+collect_domain_osint = _make_collector_task("domain")
+collect_ip_osint = _make_collector_task("ip")
+collect_email_osint = _make_collector_task("email")
+collect_media_osint = _make_collector_task("media")
+collect_darkweb_osint = _make_collector_task("darkweb")
+collect_geo_osint = _make_collector_task("geo")
+
+_COLLECTOR_TASKS = {
+    "web": collect_web_osint,
+    "social": collect_social_osint,
+    "domain": collect_domain_osint,
+    "ip": collect_ip_osint,
+    "email": collect_email_osint,
+    "media": collect_media_osint,
+    "darkweb": collect_darkweb_osint,
+    "geo": collect_geo_osint,
+}
+_COLLECTOR_TYPES = {collector_class: collector_type for collector_type, (collector_class, *_) in _COLLECTORS.items()}
 
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.collect_geo_osint")
-def collect_geo_osint(self: Task, target: str, task_id: str) -> Dict[str, Any]:
+@celery_app.task(bind=True, name="app.automation.celery_tasks.full_reconnaissance")
+def full_reconnaissance(
+    self: Task,
+    target: str,
+    task_id: str,
+    include_dark_web: bool = False,
+    include_media: bool = False,
+    inline: bool = False,
+) -> Dict[str, Any]:
     """
-    Queue geolocation OSINT collection task.
+    Run full reconnaissance with all applicable collectors.
+
+    Collectors are fanned out as a chord whose callback, normalize_collected_data,
+    is fired by the broker once every collector has finished, so this task
+    returns as soon as the fan-out is queued.
+
+    With ``inline`` the collectors instead run concurrently on this worker's
+    event loop and are normalized in-process, skipping the broker round-trip
+    per collector. This suits single-worker deployments and small targets.
 
     Args:
-        target: Target (address or coordinates)
+        target: Target to collect
         task_id: Task ID for tracking
+        include_dark_web: Include dark web collection
+        include_media: Include media collection
+        inline: Run collectors in this process instead of via the broker
 
     Returns:
-        Collection result
+        Dispatch information with the chord callback task ID, or the
+        normalization summary when run inline
+
+    Timestamps are integer nanoseconds since the epoch (``*_ns``); they are
+    rendered to ISO 8601 only where they are presented.
     """
-    logger.info(f"Geo OSINT task started for {target} (task_id: {task_id})")
+    logger.info(f"Full reconnaissance started for {target} (task_id: {task_id})")
 
     try:
         with AsyncTaskContext() as loop:
-            config = CollectorConfig(target=target, data_type=DataType.TEXT)
-            collector = GeoCollector(config)
+            from app.services.collection_pipeline_service import \
+                CollectionPipelineService
+            pipeline = CollectionPipelineService()
 
-            async def run_collector():
-                async with collector:
-                    result = await collector.execute()
-                    return result
+            ethical_verdict = loop.run_until_complete(
+                pipeline.compliance_checker.get_ethical_verdict(target, "collection")
+            )
+            if not ethical_verdict.get("allowed", False):
+                return {
+                    "task_id": task_id,
+                    "target": target,
+                    "status": "FAILED",
+                    "errors": [f"Ethics check failed: {ethical_verdict.get('reason', '')}"],
+                }
 
-            result = loop.run_until_complete(run_collector())
+            collectors = loop.run_until_complete(
+                pipeline.route_to_collectors(
+                    target,
+                    include_dark_web=include_dark_web,
+                    include_media=include_media,
+                )
+            )
 
-            logger.info(f"Geo OSINT task completed for {target}: {result.success}")
+        collection_types = list(dict.fromkeys(_COLLECTOR_TYPES[type(c)] for c in collectors))
+
+        if not collection_types:
             return {
-                "success": result.success,
-                "data": result.data,
-                "errors": result.errors,
-                "risk_level": result.risk_level.value,
-                "collection_time": result.collection_time,
+                "task_id": task_id,
+                "target": target,
+                "status": "FAILED",
+                "errors": ["No collectors found for target type"],
             }
 
+        if inline:
+            with AsyncTaskContext() as loop:
+                collection_results = loop.run_until_complete(
+                    asyncio.gather(*(_collect(t, target, task_id) for t in collection_types))
+                )
+
+            logger.info(f"Full reconnaissance ran {len(collection_types)} collectors inline for {target}")
+            return normalize_collected_data(collection_results, target=target, task_id=task_id)
+
+        callback = chord([_COLLECTOR_TASKS[t].s(target, task_id) for t in collection_types])(
+            normalize_collected_data.s(target=target, task_id=task_id)
+        )
+
+        logger.info(f"Full reconnaissance dispatched {len(collection_types)} collectors for {target}")
+
+        return {
+            "task_id": task_id,
+            "target": target,
+            "status": "RUNNING",
+            "started_at_ns": time.time_ns(),
+            "collectors": collection_types,
+            "callback_id": callback.id,
+        }
+
     except Exception as e:
-        logger.exception(f"Geo OSINT task failed for {target}: {e}")
+        logger.exception(f"Full reconnaissance failed for {target}: {e}")
         return {
-            "success": False,
+            "task_id": task_id,
+            "target": target,
+            "status": "FAILED",
             "errors": [str(e)],
-            "risk_level": "INFO",
-            "collection_time": 0,
         }
 
 
-@celery_app.task(bind=True, name="app.automation.celery_tasks.full_reconnaissance")
-def full_reconnaissance(
-    self: Task,
-    target: str,
-    task_id: str,
-    include_dark_web: bool = False,
-    include_media: bool = False,
+@celery_app.task(bind=True, name="app.automation.celery_tasks.normalize_collected_data")
+def normalize_collected_data(
+    self: Task, collection_results: List[Dict[str, Any]], target: str, task_id: str
 ) -> Dict[str, Any]:
     """
-    Run full reconnaissance with all applicable collectors.
+    Normalize and persist the results of a full reconnaissance fan-out.
 
     Args:
-        target: Target to collect
+        collection_results: Results of the individual collector tasks
+        target: Target that was collected
         task_id: Task ID for tracking
-        include_dark_web: Include dark web collection
-        include_media: Include media collection
 
     Returns:
         Full collection result
     """
-    logger.info(f"Full reconnaissance started for {target} (task_id: {task_id})")
+    logger.info(f"Normalizing {len(collection_results)} collector results for {target} (task_id: {task_id})")
+
+    errors = [error for result in collection_results for error in result.get("errors", [])]
+    collection_results = _load_entities(collection_results)
 
     try:
         with AsyncTaskContext() as loop:
-            # Initialize pipeline service
             from app.services.collection_pipeline_service import \
                 CollectionPipelineService
             pipeline = CollectionPipelineService()
 
-            async def run_pipeline():
+            async def run_processing():
                 await pipeline.initialize()
-                result = await pipeline.start_collection_task(
-                    target=target,
-                    include_dark_web=include_dark_web,
-                    include_media=include_media,
-                )
-                return result
+                return await pipeline.process_results(collection_results, task_id)
 
-            result = loop.run_until_complete(run_pipeline())
+            created_data = loop.run_until_complete(run_processing())
 
-            logger.info(f"Full reconnaissance completed for {target}: {result.get('status')}")
+        logger.info(f"Full reconnaissance completed for {target}")
 
-            return result
+        return {
+            "task_id": task_id,
+            "target": target,
+            "status": "COMPLETED",
+            "progress": 100,
+            "entities_collected": len(created_data["entities"]),
+            "relationships_collected": len(created_data["relationships"]),
+            "completed_at_ns": time.time_ns(),
+            "errors": errors,
+        }
 
     except Exception as e:
-        logger.exception(f"Full reconnaissance failed for {target}: {e}")
+        logger.exception(f"Normalizing collected data failed for {target}: {e}")
         return {
             "task_id": task_id,
             "target": target,
             "status": "FAILED",
-            "errors": [str(e)],
+            "errors": errors + [str(e)],
         }
 
 
@@ -518,19 +595,10 @@ def queue_collection(target: str, collection_type: str, task_id: str, **kwargs)
     Returns:
         Celery task ID or None
     """
-    task_map = {
-        "web": collect_web_osint,
-        "social": collect_social_osint,
-        "domain": collect_domain_osint,
-        "ip": collect_ip_osint,
-        "email": collect_email_osint,
-        "media": collect_media_osint,
-        "darkweb": collect_darkweb_osint,
-        "geo": collect_geo_osint,
-        "full": full_reconnaissance,
-    }
-
-    task_func = task_map.get(collection_type)
+    if collection_type == "full":
+        task_func = full_reconnaissance
+    else:
+        task_func = _COLLECTOR_TASKS.get(collection_type)
 
     if not task_func:
         logger.error(f"Unknown collection type: {collection_type}")
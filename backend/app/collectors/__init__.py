@@ -4,17 +4,15 @@ ReconVault Collectors Module
 Provides OSINT collectors for various data sources.
 """
 
+import functools
+import importlib
+import re
+from types import MappingProxyType
+from typing import List, Sequence
+
 from app.collectors.base_collector import (BaseCollector, CollectionResult,
                                            CollectorConfig, DataType,
                                            RiskLevel, UserAgentRotator)
-from app.collectors.darkweb_collector import DarkWebCollector
-from app.collectors.domain_collector import DomainCollector
-from app.collectors.email_collector import EmailCollector
-from app.collectors.geo_collector import GeoCollector
-from app.collectors.ip_collector import IPCollector
-from app.collectors.media_collector import MediaCollector
-from app.collectors.social_collector import SocialCollector
-from app.collectors.web_collector import WebCollector
 
 __all__ = [
     # Base classes
@@ -35,6 +33,67 @@ __all__ = [
     "GeoCollector",
 ]
 
+# Collector classes are imported on first access (PEP 562): their modules pull
+# in OpenCV, geopy, nmap, DNS and WHOIS libraries that callers of e.g.
+# infer_data_type never need
+_LAZY_COLLECTORS = {
+    "WebCollector": "web_collector",
+    "SocialCollector": "social_collector",
+    "DomainCollector": "domain_collector",
+    "IPCollector": "ip_collector",
+    "EmailCollector": "email_collector",
+    "MediaCollector": "media_collector",
+    "DarkWebCollector": "darkweb_collector",
+    "GeoCollector": "geo_collector",
+}
+
+
+def _load_collector(name: str) -> type:
+    """Import a collector class and bind it in this module"""
+    module = importlib.import_module(f"{__name__}.{_LAZY_COLLECTORS[name]}")
+    collector_class = getattr(module, name)
+    globals()[name] = collector_class
+    return collector_class
+
+
+def __getattr__(name: str):
+    if name in _LAZY_COLLECTORS:
+        return _load_collector(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Email, IP, URL scheme and coordinates as one anchored alternation, so a
+# target is classified by a single match and its lastgroup. Bounded character
+# classes keep failing matches linear on long near-miss input; re.ASCII keeps
+# \d and case folding to ASCII (targets are hostnames, addresses and URLs).
+_TARGET_RE = re.compile(
+    r"(?P<email>(?i:[a-z0-9._%+\-]{1,64}@[a-z0-9.\-]{1,253}\.[a-z]{2,24}))$"
+    r"|(?P<ip>(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d))$"
+    r"|(?P<url>https?://)"
+    r"|(?P<coord>-?\d+\.?\d*,-?\d+\.?\d*)$",
+    re.ASCII,
+)
+_SOCIAL_RE = re.compile(
+    r"(?:twitter|github|facebook|instagram|linkedin|reddit)\.com",
+    re.IGNORECASE | re.ASCII,
+)
+
+# Data type -> collector class name used by CollectorFactory
+_COLLECTORS = MappingProxyType(
+    {
+        DataType.URL: "WebCollector",
+        DataType.DOMAIN: "DomainCollector",
+        DataType.IP: "IPCollector",
+        DataType.EMAIL: "EmailCollector",
+        DataType.USERNAME: "SocialCollector",
+        DataType.SOCIAL_PROFILE: "SocialCollector",
+        DataType.IMAGE: "MediaCollector",
+        DataType.AUDIO: "MediaCollector",
+        DataType.VIDEO: "MediaCollector",
+        DataType.TEXT: "WebCollector",
+    }
+)
+
 
 class CollectorFactory:
     """Factory for creating collectors based on data type"""
@@ -54,27 +113,16 @@ class CollectorFactory:
         Raises:
             ValueError: If data type not supported
         """
-        collectors = {
-            DataType.URL: WebCollector,
-            DataType.DOMAIN: DomainCollector,
-            DataType.IP: IPCollector,
-            DataType.EMAIL: EmailCollector,
-            DataType.USERNAME: SocialCollector,
-            DataType.SOCIAL_PROFILE: SocialCollector,
-            DataType.IMAGE: MediaCollector,
-            DataType.AUDIO: MediaCollector,
-            DataType.VIDEO: MediaCollector,
-            DataType.TEXT: WebCollector,
-        }
-
-        collector_class = collectors.get(data_type)
-
-        if not collector_class:
+        collector_name = _COLLECTORS.get(data_type)
+
+        if not collector_name:
             raise ValueError(f"No collector available for data type: {data_type}")
 
+        collector_class = globals().get(collector_name) or _load_collector(collector_name)
         return collector_class(config)
 
 
+@functools.lru_cache(maxsize=4096)
 def infer_data_type(target: str) -> DataType:
     """
     Infer data type from target string.
@@ -85,43 +133,48 @@ def infer_data_type(target: str) -> DataType:
     Returns:
         Inferred DataType
     """
-    import re
-
-    # Email
-    email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    if re.match(email_pattern, target):
+    # Only emails (contain "@"), IPs and coordinates (leading digit or "-") and
+    # URLs (leading "h") can match _TARGET_RE; plain domains and usernames
+    # skip the regex entirely
+    first = target[:1]
+    if "@" in target or first.isdigit() or first in "h-":
+        match = _TARGET_RE.match(target)
+        kind = match.lastgroup if match else None
+    else:
+        kind = None
+
+    if kind == "email":
         return DataType.EMAIL
 
-    # IP address
-    ip_pattern = r"^(\d{1,3}\.){3}\d{1,3}$"
-    if re.match(ip_pattern, target):
+    if kind == "ip":
         return DataType.IP
 
-    # URL
-    if target.startswith(("http://", "https://")):
+    if kind == "url":
         return DataType.URL
 
     # Domain (has a dot, not IP, not email)
     if "." in target and not target.startswith(".") and "@" not in target:
         # Check if it might be a social URL
-        if any(
-            platform in target.lower()
-            for platform in [
-                "twitter.com",
-                "github.com",
-                "facebook.com",
-                "instagram.com",
-                "linkedin.com",
-                "reddit.com",
-            ]
-        ):
+        if _SOCIAL_RE.search(target):
             return DataType.SOCIAL_PROFILE
         return DataType.DOMAIN
 
     # Coordinates (lat,lon)
-    coord_pattern = r"^-?\d+\.?\d*,-?\d+\.?\d*$"
-    if re.match(coord_pattern, target):
+    if kind == "coord":
         return DataType.TEXT  # Will be handled by geo collector
 
     # Default to username/text
     return DataType.USERNAME
+
+
+def infer_data_types(targets: Sequence[str]) -> List[DataType]:
+    """
+    Infer data types for a batch of targets.
+
+    Args:
+        targets: Target strings
+
+    Returns:
+        Inferred DataType for each target, in order
+    """
+    return [infer_data_type(target) for target in targets]
@@ -5,16 +5,40 @@ Provides abstract base class and common functionality for all OSINT collectors.
 """
 
 import asyncio
+import functools
+import itertools
+import json
+import os
+import random
+import re
 import time
 import uuid
+import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import quote, unquote, urlparse, urlunparse
 from urllib.robotparser import RobotFileParser
 
 import httpx
 from loguru import logger
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential_jitter
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class DataType(Enum):
@@ -43,7 +67,34 @@ class RiskLevel(Enum):
     INFO = "INFO"
 
 
-@dataclass
+# Risk levels from least to most severe, and each level's rank by value
+_RISK_SEVERITY = (RiskLevel.INFO, RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+_RISK_RANK = {level.value: rank for rank, level in enumerate(_RISK_SEVERITY)}
+
+
+def highest_risk_level(entities: Iterable[Dict[str, Any]]) -> RiskLevel:
+    """
+    Get the most severe risk level among entities in one pass.
+
+    Entities without a known risk level (e.g. relationships) count as INFO.
+
+    Args:
+        entities: Collected entities
+
+    Returns:
+        Most severe risk level, INFO when there are none
+    """
+    worst = 0
+    for entity in entities:
+        rank = _RISK_RANK.get(entity.get("risk_level"), 0)
+        if rank > worst:
+            worst = rank
+            if worst == len(_RISK_SEVERITY) - 1:
+                break
+    return _RISK_SEVERITY[worst]
+
+
+@dataclass(slots=True)
 class CollectorConfig:
     """Configuration for collectors"""
 
@@ -56,9 +107,10 @@ class CollectorConfig:
     user_agent: Optional[str] = None
     proxy: Optional[str] = None
     verify_ssl: bool = True
+    session: Optional[httpx.AsyncClient] = None  # shared client, not owned by the collector
 
 
-@dataclass
+@dataclass(slots=True)
 class CollectionResult:
     """Result from a collector"""
 
@@ -71,6 +123,20 @@ class CollectionResult:
     correlation_id: str = ""
     collection_time: float = 0.0
 
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the result to JSON bytes.
+
+        Uses orjson when available, which encodes the dataclass and its
+        entity list directly without building an intermediate dict.
+
+        Returns:
+            JSON-encoded result
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(asdict(self), default=lambda o: getattr(o, "value", str(o))).encode()
+
 
 class UserAgentRotator:
     """Rotates user agents to avoid detection"""
@@ -84,19 +150,261 @@ class UserAgentRotator:
     ]
 
     def __init__(self):
-        self.current_index = 0
+        # next() on a cycle is a single C-level step, so concurrent callers
+        # cannot interleave a read-modify-write of an index
+        self._cycle = itertools.cycle(self.USER_AGENTS)
+        self._random = random.Random()
 
     def get_user_agent(self) -> str:
         """Get next user agent in rotation"""
-        ua = self.USER_AGENTS[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.USER_AGENTS)
-        return ua
+        return next(self._cycle)
 
     def get_random_user_agent(self) -> str:
         """Get a random user agent"""
-        import random
+        return self._random.choice(self.USER_AGENTS)
+
+
+# Pooled HTTP clients shared by collectors, keyed by event loop and transport
+# settings, so collectors hitting the same hosts reuse sockets and TLS sessions
+_CLIENT_POOL: Dict[tuple, httpx.AsyncClient] = {}
+_DEFAULT_USER_AGENT = f"python-httpx/{httpx.__version__}"
+_user_agent_rotator = UserAgentRotator()
+
 
-        return random.choice(self.USER_AGENTS)
+async def _rotate_user_agent(request: httpx.Request) -> None:
+    """Give requests without an explicit User-Agent a rotated one"""
+    if request.headers.get("User-Agent") == _DEFAULT_USER_AGENT:
+        request.headers["User-Agent"] = _user_agent_rotator.get_random_user_agent()
+
+
+def get_shared_client(
+    proxy: Optional[str] = None,
+    verify_ssl: bool = True,
+    timeout: float = 30,
+    user_agent: Optional[str] = None,
+    keepalive_expiry: float = 5.0,
+) -> httpx.AsyncClient:
+    """
+    Get pooled HTTP client for the running event loop and transport settings.
+
+    Pooled clients are not owned by any collector; close them with
+    close_shared_clients() when the loop shuts down.
+
+    Args:
+        proxy: Proxy URL
+        verify_ssl: Verify TLS certificates
+        timeout: Request timeout in seconds
+        user_agent: Fixed User-Agent (rotated per request if None)
+        keepalive_expiry: Seconds an idle connection is kept for reuse
+
+    Returns:
+        Shared AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, proxy, verify_ssl, timeout, user_agent, keepalive_expiry)
+
+    client = _CLIENT_POOL.get(key)
+    if client is not None and not client.is_closed:
+        return client
+
+    # Drop clients left behind by loops that no longer run
+    for stale in [k for k in _CLIENT_POOL if k[0].is_closed()]:
+        del _CLIENT_POOL[stale]
+
+    client = httpx.AsyncClient(
+        timeout=timeout,
+        headers={"User-Agent": user_agent} if user_agent else None,
+        verify=verify_ssl,
+        proxy=proxy,
+        follow_redirects=True,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_keepalive_connections=100,
+            max_connections=200,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        event_hooks=None if user_agent else {"request": [_rotate_user_agent]},
+    )
+    _CLIENT_POOL[key] = client
+
+    return client
+
+
+# Seconds a DNS query may take, including retries across nameservers
+DNS_TIMEOUT = 5
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_resolver() -> Any:
+    """
+    Get the process-wide async DNS resolver.
+
+    resolv.conf is read once; queries run on the caller's event loop
+    instead of blocking it.
+
+    Returns:
+        Shared dns.asyncresolver.Resolver
+    """
+    # Imported here so importing the package does not load dnspython
+    import dns.asyncresolver
+
+    resolver = dns.asyncresolver.Resolver()
+    resolver.timeout = DNS_TIMEOUT
+    resolver.lifetime = DNS_TIMEOUT
+    return resolver
+
+
+async def close_shared_clients() -> None:
+    """Close pooled HTTP clients belonging to the running event loop"""
+    loop = asyncio.get_running_loop()
+
+    for key in [k for k in _CLIENT_POOL if k[0] is loop]:
+        client = _CLIENT_POOL.pop(key)
+        if not client.is_closed:
+            await client.aclose()
+
+
+@functools.lru_cache(maxsize=8192)
+def _base_url(url: str) -> str:
+    """scheme://netloc of a URL (memoized, URLs repeat heavily per host)"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+@functools.lru_cache(maxsize=8192)
+def _host_of(target: str) -> str:
+    """Host of a URL, or the target itself when it is a bare host"""
+    return urlparse(target).netloc or target
+
+
+# Global cap on concurrently executing collectors, per event loop, so large
+# fan-outs cannot exhaust sockets or the connection pools
+COLLECTOR_MAX_CONCURRENCY = int(os.getenv("COLLECTOR_MAX_CONCURRENCY", "50"))
+_EXECUTE_SEMAPHORES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_execute_semaphore() -> asyncio.Semaphore:
+    """Get the collector concurrency semaphore of the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _EXECUTE_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(COLLECTOR_MAX_CONCURRENCY)
+        _EXECUTE_SEMAPHORES[loop] = semaphore
+    return semaphore
+
+
+# Next free request slot (monotonic time) per destination host, shared by all
+# collectors in the process so politeness is enforced per host, not per collector
+_HOST_NEXT_SLOT: Dict[str, float] = {}
+HOST_SLOT_MAX_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=8192)
+def _robots_path(url: str) -> str:
+    """Normalize a URL or path the way RobotFileParser.can_fetch does"""
+    parsed = urlparse(unquote(url))
+    path = quote(
+        urlunparse(("", "", parsed.path, parsed.params, parsed.query, parsed.fragment))
+    )
+    return path or "/"
+
+
+class _RobotsRules:
+    """
+    robots.txt rules compiled into one anchored regex per user agent.
+
+    Each rule line becomes a named alternative in file order, so the first
+    matching alternative is the first matching rule, exactly as in
+    RobotFileParser, but the path is checked in a single regex match.
+    """
+
+    def __init__(self, parser: RobotFileParser):
+        self.parser = parser
+        self._patterns: Dict[str, Optional[re.Pattern]] = {}
+
+    def _pattern_for(self, user_agent: str) -> Optional[re.Pattern]:
+        if user_agent in self._patterns:
+            return self._patterns[user_agent]
+
+        entry = next(
+            (e for e in self.parser.entries if e.applies_to(user_agent)),
+            self.parser.default_entry,
+        )
+
+        pattern = None
+        if entry is not None and entry.rulelines:
+            pattern = re.compile(
+                "|".join(
+                    f"(?P<{'a' if line.allowance else 'd'}{i}>"
+                    f"{'' if line.path == '*' else re.escape(line.path)})"
+                    for i, line in enumerate(entry.rulelines)
+                )
+            )
+
+        self._patterns[user_agent] = pattern
+        return pattern
+
+    def can_fetch(self, user_agent: str, url: str) -> bool:
+        """Whether user_agent may fetch url (same answer as RobotFileParser)"""
+        pattern = self._pattern_for(user_agent)
+        if pattern is None:
+            return True
+
+        match = pattern.match(_robots_path(url))
+        return match is None or match.lastgroup[0] == "a"
+
+
+# Parsed robots.txt per scheme://netloc, shared by all collectors in the
+# process: base_url -> (expires_at, rules or None when the host has none)
+ROBOTS_CACHE_TTL = 3600
+ROBOTS_CACHE_MAX_SIZE = 1024
+_ROBOTS_CACHE: Dict[str, tuple] = {}
+_ROBOTS_LOCKS: Dict[str, asyncio.Lock] = {}
+
+
+def _cache_robots(base_url: str, rules: Optional[_RobotsRules]) -> None:
+    """Store robots.txt rules, evicting expired or oldest entries when full"""
+    if len(_ROBOTS_CACHE) >= ROBOTS_CACHE_MAX_SIZE:
+        now = time.monotonic()
+        for url in [u for u, (expires_at, _) in _ROBOTS_CACHE.items() if expires_at <= now]:
+            del _ROBOTS_CACHE[url]
+            _ROBOTS_LOCKS.pop(url, None)
+        while len(_ROBOTS_CACHE) >= ROBOTS_CACHE_MAX_SIZE:
+            url = next(iter(_ROBOTS_CACHE))
+            del _ROBOTS_CACHE[url]
+            _ROBOTS_LOCKS.pop(url, None)
+
+    _ROBOTS_CACHE[base_url] = (time.monotonic() + ROBOTS_CACHE_TTL, rules)
+
+
+# Sentinel returned by _lru_get when nothing unexpired is cached, so None can
+# be cached as a value (e.g. an unreachable site)
+_MISS = object()
+
+
+def _lru_get(cache: OrderedDict, key: Any) -> Any:
+    """Get an unexpired cached value, marking it recently used (_MISS if none)"""
+    entry = cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return _MISS
+    cache.move_to_end(key)
+    return entry[1]
+
+
+def _lru_put(
+    cache: OrderedDict,
+    locks: Dict[Any, asyncio.Lock],
+    key: Any,
+    value: Any,
+    ttl: float,
+    max_size: int,
+) -> None:
+    """Store a value for ttl seconds, evicting least recently used entries"""
+    cache[key] = (time.monotonic() + ttl, value)
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        evicted, _ = cache.popitem(last=False)
+        locks.pop(evicted, None)
 
 
 class BaseCollector(ABC):
@@ -117,13 +425,9 @@ class BaseCollector(ABC):
         self.correlation_id = str(uuid.uuid4())
         self.user_agent_rotator = UserAgentRotator()
         self.session: Optional[httpx.AsyncClient] = None
-        self.last_request_time = 0.0
-        self.robots_cache: Dict[str, RobotFileParser] = {}
+        self._log = logger.bind(correlation_id=self.correlation_id, collector=self.name)
 
-        logger.info(
-            f"Initialized collector {self.name}",
-            extra={"correlation_id": self.correlation_id, "target": config.target},
-        )
+        self._log.info(f"Initialized collector {self.name}", target=config.target)
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -136,41 +440,50 @@ class BaseCollector(ABC):
 
     async def _init_session(self):
         """Initialize HTTP session"""
-        user_agent = (
-            self.config.user_agent or self.user_agent_rotator.get_random_user_agent()
-        )
-        headers = {"User-Agent": user_agent}
+        if self.config.session is not None:
+            self.session = self.config.session
+            logger.debug(f"Using shared HTTP session for {self.name}")
+            return
 
-        self.session = httpx.AsyncClient(
-            timeout=self.config.timeout,
-            headers=headers,
-            verify=self.config.verify_ssl,
+        self.session = get_shared_client(
             proxy=self.config.proxy,
-            follow_redirects=True,
+            verify_ssl=self.config.verify_ssl,
+            timeout=self.config.timeout,
+            user_agent=self.config.user_agent,
         )
 
         logger.debug(f"HTTP session initialized for {self.name}")
 
     async def _close_session(self):
-        """Close HTTP session"""
-        if self.session:
-            await self.session.aclose()
-            logger.debug(f"HTTP session closed for {self.name}")
-
-    async def _apply_rate_limit(self):
-        """Apply rate limiting between requests"""
-        now = time.time()
-        time_since_last = now - self.last_request_time
-
-        if time_since_last < self.config.rate_limit:
-            delay = self.config.rate_limit - time_since_last
-            logger.debug(
-                f"Rate limiting: waiting {delay:.2f}s",
-                extra={"correlation_id": self.correlation_id},
-            )
-            await asyncio.sleep(delay)
+        """Release HTTP session (shared clients stay open for reuse)"""
+        self.session = None
+
+    async def _apply_rate_limit(self, url: Optional[str] = None):
+        """
+        Apply per-host rate limiting between requests.
+
+        Requests to the same host, from any collector, are spaced at least
+        config.rate_limit seconds apart; requests to different hosts do not
+        wait on each other.
 
-        self.last_request_time = time.time()
+        Args:
+            url: URL about to be requested (defaults to the collector target)
+        """
+        host = _host_of(url or self.config.target)
+
+        now = time.monotonic()
+        if len(_HOST_NEXT_SLOT) >= HOST_SLOT_MAX_SIZE:
+            for stale in [h for h, slot in _HOST_NEXT_SLOT.items() if slot <= now]:
+                del _HOST_NEXT_SLOT[stale]
+
+        # Reserve the slot before awaiting so concurrent callers queue up
+        slot = max(now, _HOST_NEXT_SLOT.get(host, now))
+        _HOST_NEXT_SLOT[host] = slot + self.config.rate_limit
+
+        delay = slot - now
+        if delay > 0:
+            self._log.debug("Rate limiting {}: waiting {:.2f}s", host, delay)
+            await asyncio.sleep(delay)
 
     async def _check_robots_txt(self, url: str, path: str = "/") -> bool:
         """
@@ -183,36 +496,15 @@ class BaseCollector(ABC):
             return True
 
         try:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(url)
-            base_url = f"{parsed.scheme}://{parsed.netloc}"
-
-            if base_url not in self.robots_cache:
-                robots_url = f"{base_url}/robots.txt"
-                try:
-                    response = await self.session.get(robots_url, timeout=10)
-                    if response.status_code == 200:
-                        rp = RobotFileParser()
-                        rp.parse(response.text.splitlines())
-                        self.robots_cache[base_url] = rp
-                        logger.debug(f"Loaded robots.txt for {base_url}")
-                    else:
-                        logger.debug(f"No robots.txt at {base_url}, allowing access")
-                        return True
-                except Exception as e:
-                    logger.warning(f"Failed to fetch robots.txt: {e}")
-                    return True
-
-            robot_parser = self.robots_cache[base_url]
+            robots_rules = await self._get_robots_rules(_base_url(url))
+            if robots_rules is None:
+                return True
+
             user_agent = self.config.user_agent or "*"
-            allowed = robot_parser.can_fetch(user_agent, path)
+            allowed = robots_rules.can_fetch(user_agent, path)
 
             if not allowed:
-                logger.warning(
-                    f"robots.txt disallows access to {path} for {user_agent}",
-                    extra={"correlation_id": self.correlation_id},
-                )
+                self._log.warning("robots.txt disallows access to {} for {}", path, user_agent)
 
             return allowed
 
@@ -220,6 +512,46 @@ class BaseCollector(ABC):
             logger.error(f"Error checking robots.txt: {e}")
             return True
 
+    async def _get_robots_rules(self, base_url: str) -> Optional[_RobotsRules]:
+        """
+        Get robots.txt rules for a host from the shared cache, fetching on miss.
+
+        Concurrent collectors wait on a per-host lock so only one of them
+        fetches a given robots.txt.
+
+        Returns:
+            Rules, or None if the host has no usable robots.txt
+        """
+        entry = _ROBOTS_CACHE.get(base_url)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        lock = _ROBOTS_LOCKS.setdefault(base_url, asyncio.Lock())
+        async with lock:
+            entry = _ROBOTS_CACHE.get(base_url)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            robots_url = f"{base_url}/robots.txt"
+            try:
+                response = await self.session.get(robots_url, timeout=10)
+            except Exception as e:
+                logger.warning(f"Failed to fetch robots.txt: {e}")
+                return None
+
+            if response.status_code != 200:
+                logger.debug(f"No robots.txt at {base_url}, allowing access")
+                _cache_robots(base_url, None)
+                return None
+
+            rp = RobotFileParser()
+            rp.parse(response.text.splitlines())
+            rules = _RobotsRules(rp)
+            _cache_robots(base_url, rules)
+            logger.debug(f"Loaded robots.txt for {base_url}")
+
+            return rules
+
     async def _retry_with_backoff(
         self, func, max_retries: Optional[int] = None, base_delay: float = 1.0
     ):
@@ -238,29 +570,29 @@ class BaseCollector(ABC):
             Last exception if all retries exhausted
         """
         retries = max_retries or self.config.max_retries
-        last_exception = None
 
-        for attempt in range(retries + 1):
-            try:
-                return await func()
-            except Exception as e:
-                last_exception = e
-                if attempt == retries:
-                    logger.error(
-                        f"All {retries} retries exhausted for {self.name}",
-                        extra={"correlation_id": self.correlation_id},
-                    )
-                    raise
-
-                delay = base_delay * (2**attempt)
-                logger.warning(
-                    f"Attempt {attempt + 1}/{retries} failed for {self.name}: {e}, "
-                    f"retrying in {delay:.2f}s",
-                    extra={"correlation_id": self.correlation_id},
-                )
-                await asyncio.sleep(delay)
+        def log_retry(retry_state):
+            self._log.warning(
+                "Attempt {}/{} failed for {}: {}, retrying in {:.2f}s",
+                retry_state.attempt_number,
+                retries,
+                self.name,
+                retry_state.outcome.exception(),
+                retry_state.next_action.sleep,
+            )
 
-        raise last_exception
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(retries + 1),
+                wait=wait_exponential_jitter(initial=base_delay, jitter=base_delay),
+                before_sleep=log_retry,
+                reraise=True,
+            ):
+                with attempt:
+                    return await func()
+        except Exception:
+            self._log.error(f"All {retries} retries exhausted for {self.name}")
+            raise
 
     @abstractmethod
     async def collect(self) -> CollectionResult:
@@ -311,25 +643,23 @@ class BaseCollector(ABC):
         Returns:
             CollectionResult with success/failure status
         """
-        start_time = time.time()
+        start_time = time.monotonic()
 
         result = CollectionResult(
             success=False, collector_name=self.name, correlation_id=self.correlation_id
         )
 
         try:
-            logger.info(
+            self._log.info(
                 f"Starting collection with {self.name}",
-                extra={
-                    "correlation_id": self.correlation_id,
-                    "target": self.config.target,
-                    "data_type": self.config.data_type.value,
-                },
+                target=self.config.target,
+                data_type=self.config.data_type.value,
             )
 
             await self._apply_rate_limit()
 
-            raw_result = await self._retry_with_backoff(self.collect)
+            async with _get_execute_semaphore():
+                raw_result = await self._retry_with_backoff(self.collect)
 
             result.success = raw_result.success
             result.data = raw_result.data
@@ -337,36 +667,24 @@ class BaseCollector(ABC):
             result.risk_level = raw_result.risk_level
             result.metadata = raw_result.metadata
 
-            collection_time = time.time() - start_time
+            collection_time = time.monotonic() - start_time
             result.collection_time = collection_time
 
             if result.success:
-                logger.info(
+                self._log.info(
                     f"Collection completed by {self.name}",
-                    extra={
-                        "correlation_id": self.correlation_id,
-                        "entities_collected": len(result.data),
-                        "collection_time": f"{collection_time:.2f}s",
-                        "risk_level": result.risk_level.value,
-                    },
+                    entities_collected=len(result.data),
+                    collection_time=f"{collection_time:.2f}s",
+                    risk_level=result.risk_level.value,
                 )
             else:
-                logger.error(
-                    f"Collection failed for {self.name}",
-                    extra={
-                        "correlation_id": self.correlation_id,
-                        "errors": result.errors,
-                    },
-                )
+                self._log.error(f"Collection failed for {self.name}", errors=result.errors)
 
         except Exception as e:
             result.errors.append(str(e))
-            result.collection_time = time.time() - start_time
+            result.collection_time = time.monotonic() - start_time
 
-            logger.exception(
-                f"Exception in {self.name}",
-                extra={"correlation_id": self.correlation_id},
-            )
+            self._log.exception(f"Exception in {self.name}")
 
         return result
 
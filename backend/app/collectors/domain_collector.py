@@ -11,18 +11,180 @@ Collects OSINT data for domains including:
 """
 
 import asyncio
+import functools
+import itertools
+import os
 import re
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import dns.asyncresolver
+import dns.name
 import dns.resolver
+import httpx
 import whois
 from bs4 import BeautifulSoup
 from loguru import logger
 
-from app.collectors.base_collector import (BaseCollector, CollectionResult,
-                                           CollectorConfig, DataType,
-                                           RiskLevel)
+from app.collectors.base_collector import (_MISS, DNS_TIMEOUT, BaseCollector,
+                                           CollectionResult, CollectorConfig,
+                                           DataType, RiskLevel, _lru_get,
+                                           _lru_put, get_shared_resolver,
+                                           highest_risk_level)
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Record types fetched during DNS enumeration
+DNS_RECORD_TYPES = ("A", "AAAA", "MX", "TXT", "NS", "CNAME", "SOA", "SRV", "PTR")
+
+# Wayback Machine CDX API. Requested over https directly: the http URL
+# answers with a redirect, costing a round trip and ruling out HTTP/2
+WAYBACK_CDX_URL = "https://web.archive.org/cdx/search/cdx"
+# Connecting to archive.org is quick when it works; the CDX query is not
+WAYBACK_TIMEOUT = httpx.Timeout(15, connect=5)
+
+# Host part of a target given as a URL: optional scheme, userinfo and port
+_URL_HOST_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]*@)?([^:/?#\s]+)")
+
+# Reputation heuristics, checked against the lowercased domain
+_SUSPICIOUS_TLDS = (".xyz", ".top", ".zip", ".mov", ".tk", ".ml")
+_RANDOM_PATTERN_RE = re.compile(r"^[a-z0-9-]+$")
+
+# Optional upstream resolvers to race each query across, e.g.
+# "1.1.1.1,8.8.8.8,9.9.9.9". Off by default: racing discloses the target
+# domains to every listed resolver. The fastest DNS_RACE_FANOUT of them, by
+# moving-average latency, get each query and the first reply wins
+DNS_RACE_NAMESERVERS = tuple(
+    ns.strip() for ns in os.getenv("DNS_RACE_NAMESERVERS", "").split(",") if ns.strip()
+)
+DNS_RACE_FANOUT = 3
+DNS_LATENCY_ALPHA = 0.3  # weight of the newest sample in a resolver's latency
+_NAMESERVER_LATENCY: Dict[str, float] = {}
+
+# WHOIS calls block for seconds; they get their own threads so they cannot
+# starve the default executor, and each registry sees a few at a time
+WHOIS_MAX_WORKERS = int(os.getenv("WHOIS_MAX_WORKERS", "8"))
+WHOIS_PER_TLD_CONCURRENCY = 2
+_WHOIS_EXECUTOR = ThreadPoolExecutor(max_workers=WHOIS_MAX_WORKERS, thread_name_prefix="whois")
+_WHOIS_SEMAPHORES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# DNS answers shared by all collectors in the process in LRU order:
+# (domain, record type) -> (expires_at, answer, or None when the name has no
+# such record). Answers live for their own TTL within these bounds; failed
+# lookups (timeouts, SERVFAIL) are not cached
+DNS_CACHE_MIN_TTL = 60
+DNS_CACHE_MAX_TTL = 3600
+DNS_CACHE_MAX_SIZE = 8192
+_DNS_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+_DNS_LOCKS: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+# WHOIS records change on a scale of days: domain -> (expires_at, record)
+WHOIS_CACHE_TTL = 86400
+WHOIS_CACHE_MAX_SIZE = 2048
+_WHOIS_CACHE: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+_WHOIS_LOCKS: Dict[str, asyncio.Lock] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _nameserver_resolver(nameserver: str) -> dns.asyncresolver.Resolver:
+    """Get an async resolver that only asks the given nameserver"""
+    resolver = dns.asyncresolver.Resolver(configure=False)
+    resolver.nameservers = [nameserver]
+    resolver.timeout = DNS_TIMEOUT
+    resolver.lifetime = DNS_TIMEOUT
+    return resolver
+
+
+def _record_latency(nameserver: str, seconds: float) -> None:
+    """Fold a reply time into the nameserver's moving-average latency"""
+    previous = _NAMESERVER_LATENCY.get(nameserver)
+    if previous is None:
+        _NAMESERVER_LATENCY[nameserver] = seconds
+    else:
+        _NAMESERVER_LATENCY[nameserver] = previous + DNS_LATENCY_ALPHA * (seconds - previous)
+
+
+async def _timed_resolve(nameserver: str, domain: str, record_type: str) -> Any:
+    """Resolve on one nameserver, recording how long it took to answer"""
+    started = time.monotonic()
+    try:
+        answer = await _nameserver_resolver(nameserver).resolve(domain, record_type, raise_on_no_answer=False)
+    except (dns.resolver.NXDOMAIN, asyncio.CancelledError):
+        # A query cancelled because another nameserver won took at least this long
+        _record_latency(nameserver, time.monotonic() - started)
+        raise
+    except Exception:
+        # Failures rank the nameserver as if it had timed out
+        _record_latency(nameserver, DNS_TIMEOUT)
+        raise
+
+    _record_latency(nameserver, time.monotonic() - started)
+    return answer
+
+
+async def _resolve(domain: str, record_type: str) -> Any:
+    """
+    Resolve a record type, racing the fastest configured nameservers.
+
+    The first nameserver to answer wins and the other queries are cancelled.
+    A negative answer counts as an answer. When no nameservers are
+    configured, or all of them fail, the system resolver is used.
+
+    A name without records of the type is the common case, so it is not an
+    exception: the answer comes back with no rrset.
+
+    Returns:
+        DNS answer (rrset None when the name has no such record)
+
+    Raises:
+        dns.resolver.NXDOMAIN: The name does not exist
+    """
+    if DNS_RACE_NAMESERVERS:
+        # Untried nameservers rank first so every one gets measured
+        ranked = sorted(DNS_RACE_NAMESERVERS, key=lambda ns: _NAMESERVER_LATENCY.get(ns, 0.0))
+        pending = {
+            asyncio.create_task(_timed_resolve(ns, domain, record_type))
+            for ns in ranked[:DNS_RACE_FANOUT]
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None or isinstance(error, dns.resolver.NXDOMAIN):
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        logger.debug(f"All raced nameservers failed for {record_type} {domain}, using system resolver")
+
+    return await get_shared_resolver().resolve(domain, record_type, raise_on_no_answer=False)
+
+
+def _get_whois_semaphore(domain: str) -> asyncio.Semaphore:
+    """Get the WHOIS semaphore of the domain's TLD on the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphores = _WHOIS_SEMAPHORES.get(loop)
+    if semaphores is None:
+        semaphores = {}
+        _WHOIS_SEMAPHORES[loop] = semaphores
+
+    tld = domain.rsplit(".", 1)[-1].lower()
+    semaphore = semaphores.get(tld)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(WHOIS_PER_TLD_CONCURRENCY)
+        semaphores[tld] = semaphore
+    return semaphore
 
 
 class DomainCollector(BaseCollector):
@@ -47,22 +209,18 @@ class DomainCollector(BaseCollector):
         )
 
         try:
-            domain = self.config.target
-
-            # Remove protocol if present
-            domain = domain.replace("http://", "").replace("https://", "")
-            domain = domain.split("/")[0]
+            # Reduce a URL-shaped target to its bare host name
+            match = _URL_HOST_RE.match(self.config.target.strip().lower())
+            domain = match.group(1) if match else self.config.target
 
             logger.info(f"Collecting domain OSINT for {domain}")
 
             # Collect various types of data
             tasks = [
                 self._whois_lookup(domain),
-                self._dns_enumeration(domain),
+                self._dns_lookups(domain),
                 self._get_historical_data(domain),
                 self._check_reputation(domain),
-                self._get_nameservers(domain),
-                self._detect_mail_servers(domain),
             ]
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -76,15 +234,7 @@ class DomainCollector(BaseCollector):
                     result.data.extend(task_result)
 
             # Determine overall risk level
-            risk_factors = [
-                e.get("risk_level", RiskLevel.INFO.value) for e in result.data
-            ]
-            if RiskLevel.CRITICAL.value in risk_factors:
-                result.risk_level = RiskLevel.CRITICAL
-            elif RiskLevel.HIGH.value in risk_factors:
-                result.risk_level = RiskLevel.HIGH
-            elif RiskLevel.MEDIUM.value in risk_factors:
-                result.risk_level = RiskLevel.MEDIUM
+            result.risk_level = highest_risk_level(result.data)
 
             result.success = len(result.errors) == 0
             result.metadata = {
@@ -105,9 +255,7 @@ class DomainCollector(BaseCollector):
         entities = []
 
         try:
-            # WHOIS can be slow, run in thread pool
-            loop = asyncio.get_event_loop()
-            whois_data = await loop.run_in_executor(None, whois.whois, domain)
+            whois_data = await self._whois_cached(domain)
 
             if whois_data:
                 # Parse registration dates
@@ -186,56 +334,127 @@ class DomainCollector(BaseCollector):
 
         return entities
 
-    async def _dns_enumeration(self, domain: str) -> List[Dict[str, Any]]:
-        """Enumerate all DNS records"""
+    async def _whois_cached(self, domain: str) -> Any:
+        """
+        Get the WHOIS record of a domain from the shared cache, querying on
+        miss.
+
+        Concurrent collectors wait on a per-domain lock so only one of them
+        queries the registry. Failed queries raise and are not cached.
+        """
+        key = domain.lower()
+        whois_data = _lru_get(_WHOIS_CACHE, key)
+        if whois_data is not _MISS:
+            return whois_data
+
+        lock = _WHOIS_LOCKS.setdefault(key, asyncio.Lock())
+        async with lock:
+            whois_data = _lru_get(_WHOIS_CACHE, key)
+            if whois_data is not _MISS:
+                return whois_data
+
+            # WHOIS can be slow, run in its own thread pool
+            loop = asyncio.get_running_loop()
+            async with _get_whois_semaphore(domain):
+                whois_data = await loop.run_in_executor(_WHOIS_EXECUTOR, whois.whois, domain)
+
+            _lru_put(_WHOIS_CACHE, _WHOIS_LOCKS, key, whois_data, WHOIS_CACHE_TTL, WHOIS_CACHE_MAX_SIZE)
+            return whois_data
+
+    async def _dns_lookups(self, domain: str) -> List[Dict[str, Any]]:
+        """Resolve DNS once and build record, nameserver and mail server entities"""
+        records = await self._dns_all(domain)
+
+        entities = self._build_dns_entities(domain, records)
+        entities.extend(self._build_ns_entities(domain, records.get("NS", ())))
+        entities.extend(self._build_mx_entities(domain, records.get("MX", ())))
+        return entities
+
+    async def _dns_all(self, domain: str) -> Dict[str, Any]:
+        """
+        Resolve every record type in DNS_RECORD_TYPES concurrently.
+
+        Args:
+            domain: Domain to resolve
+
+        Returns:
+            DNS answers keyed by record type; types without an answer are absent
+        """
+        # Query every record type at once rather than one after another
+        answers = await asyncio.gather(
+            *(self._resolve_cached(domain, record_type) for record_type in DNS_RECORD_TYPES),
+            return_exceptions=True,
+        )
+
+        records = {}
+        for record_type, answer in zip(DNS_RECORD_TYPES, answers):
+            if answer is None or isinstance(answer, BaseException):
+                logger.debug(f"No {record_type} record for {domain}")
+                continue
+            records[record_type] = answer
+
+        return records
+
+    async def _resolve_cached(self, domain: str, record_type: str) -> Any:
+        """
+        Resolve a record type from the shared cache, querying on miss.
+
+        Concurrent lookups of the same record wait on a per-record lock so
+        only one query goes out.
+
+        Returns:
+            DNS answer, or None when the name has no such record
+        """
+        key = (domain.lower(), record_type)
+        answer = _lru_get(_DNS_CACHE, key)
+        if answer is not _MISS:
+            return answer
+
+        lock = _DNS_LOCKS.setdefault(key, asyncio.Lock())
+        async with lock:
+            answer = _lru_get(_DNS_CACHE, key)
+            if answer is not _MISS:
+                return answer
+
+            try:
+                answer = await _resolve(domain, record_type)
+            except dns.resolver.NXDOMAIN:
+                answer = None
+
+            if answer is None or answer.rrset is None:
+                answer, ttl = None, DNS_CACHE_MIN_TTL
+            else:
+                ttl = answer.rrset.ttl
+
+            ttl = min(max(ttl, DNS_CACHE_MIN_TTL), DNS_CACHE_MAX_TTL)
+            _lru_put(_DNS_CACHE, _DNS_LOCKS, key, answer, ttl, DNS_CACHE_MAX_SIZE)
+            return answer
+
+    def _build_dns_entities(self, domain: str, records: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the DOMAIN entity listing all DNS records"""
         entities = []
 
-        try:
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 10
-            resolver.lifetime = 10
-
-            record_types = [
-                "A",
-                "AAAA",
-                "MX",
-                "TXT",
-                "NS",
-                "CNAME",
-                "SOA",
-                "SRV",
-                "PTR",
-            ]
-            dns_records = {}
-
-            for record_type in record_types:
-                try:
-                    answers = resolver.resolve(domain, record_type)
-                    dns_records[record_type] = [str(rdata) for rdata in answers]
-                    await asyncio.sleep(0.3)
-                except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, Exception) as e:
-                    logger.debug(f"No {record_type} record for {domain}")
-                    continue
-
-            if dns_records:
-                entities.append(
-                    self._create_entity(
-                        entity_type="DOMAIN",
-                        value=domain,
-                        risk_level=RiskLevel.INFO,
-                        metadata={
-                            "dns_records": dns_records,
-                            "total_record_types": len(dns_records),
-                        },
-                    )
-                )
+        dns_records = {
+            record_type: [rdata.to_text() for rdata in answer]
+            for record_type, answer in records.items()
+        }
 
-                logger.info(
-                    f"DNS enumeration completed for {domain}: {list(dns_records.keys())}"
+        if dns_records:
+            entities.append(
+                self._create_entity(
+                    entity_type="DOMAIN",
+                    value=domain,
+                    risk_level=RiskLevel.INFO,
+                    metadata={
+                        "dns_records": dns_records,
+                        "total_record_types": len(dns_records),
+                    },
                 )
+            )
 
-        except Exception as e:
-            logger.error(f"Error enumerating DNS for {domain}: {e}")
+            logger.info(
+                f"DNS enumeration completed for {domain}: {list(dns_records.keys())}"
+            )
 
         return entities
 
@@ -245,23 +464,19 @@ class DomainCollector(BaseCollector):
 
         try:
             # Check Wayback Machine CDX API
-            cdx_url = "http://web.archive.org/cdx/search/cdx"
             params = {"url": domain, "output": "json", "limit": 10}
 
-            response = await self.session.get(cdx_url, params=params, timeout=15)
+            response = await self.session.get(WAYBACK_CDX_URL, params=params, timeout=WAYBACK_TIMEOUT)
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
 
                 if len(data) > 1:  # First row is headers
-                    snapshots = data[1:]
+                    snapshot_count = len(data) - 1
 
-                    # Extract years from snapshots
-                    years = set()
-                    for snapshot in snapshots:
-                        if len(snapshot) > 1:
-                            year = snapshot[1][:4]
-                            years.add(year)
+                    # Capture timestamps (yyyyMMddhhmmss) sort as strings
+                    timestamps = [row[1] for row in itertools.islice(data, 1, None) if len(row) > 1]
+                    years = {timestamp[:4] for timestamp in timestamps}
 
                     entities.append(
                         self._create_entity(
@@ -269,20 +484,16 @@ class DomainCollector(BaseCollector):
                             value=domain,
                             risk_level=RiskLevel.INFO,
                             metadata={
-                                "wayback_snapshots": len(snapshots),
-                                "years_with_data": sorted(list(years)),
-                                "oldest_snapshot": snapshots[-1][1]
-                                if snapshots
-                                else None,
-                                "newest_snapshot": snapshots[0][1]
-                                if snapshots
-                                else None,
+                                "wayback_snapshots": snapshot_count,
+                                "years_with_data": sorted(years),
+                                "oldest_snapshot": min(timestamps, default=None),
+                                "newest_snapshot": max(timestamps, default=None),
                             },
                         )
                     )
 
                     logger.info(
-                        f"Found {len(snapshots)} Wayback snapshots for {domain}"
+                        f"Found {snapshot_count} Wayback snapshots for {domain}"
                     )
 
         except Exception as e:
@@ -305,14 +516,15 @@ class DomainCollector(BaseCollector):
             # For now, do basic checks
             reputation_indicators = []
 
+            name = domain.lower()
+
             # Check for suspicious TLDs
-            suspicious_tlds = [".xyz", ".top", ".zip", ".mov", ".tk", ".ml"]
-            if any(domain.lower().endswith(tld) for tld in suspicious_tlds):
+            if name.endswith(_SUSPICIOUS_TLDS):
                 reputation_indicators.append("suspicious_tld")
 
             # Check for random-looking domains
-            if len(domain.replace("-", "").replace(".", "")) > 20:
-                if re.match(r"^[a-z0-9-]+$", domain.lower()):
+            if len(name) - name.count("-") - name.count(".") > 20:
+                if _RANDOM_PATTERN_RE.match(name):
                     reputation_indicators.append("random_pattern")
 
             risk_level = RiskLevel.INFO
@@ -338,90 +550,74 @@ class DomainCollector(BaseCollector):
 
         return entities
 
-    async def _get_nameservers(self, domain: str) -> List[Dict[str, Any]]:
-        """Get nameserver information"""
+    def _build_ns_entities(self, domain: str, answer: Any) -> List[Dict[str, Any]]:
+        """Build nameserver entities from NS records"""
         entities = []
 
-        try:
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 10
-            resolver.lifetime = 10
-
-            answers = resolver.resolve(domain, "NS")
-            nameservers = [str(rdata).rstrip(".") for rdata in answers]
-
-            for ns in nameservers:
-                entities.append(
-                    self._create_entity(
-                        entity_type="ORG",
-                        value=ns,
-                        risk_level=RiskLevel.INFO,
-                        metadata={"type": "nameserver", "serves_domain": domain},
-                    )
-                )
+        nameservers = [rdata.target.to_text(omit_final_dot=True) for rdata in answer]
 
-                # Create relationship
-                entities.append(
-                    {
-                        "relationship_type": "RELATED_TO",
-                        "source": domain,
-                        "target": ns,
-                        "metadata": {"relationship": "dns_hosting"},
-                    }
+        for ns in nameservers:
+            entities.append(
+                self._create_entity(
+                    entity_type="ORG",
+                    value=ns,
+                    risk_level=RiskLevel.INFO,
+                    metadata={"type": "nameserver", "serves_domain": domain},
                 )
+            )
 
-            logger.info(f"Found {len(nameservers)} nameservers for {domain}")
+            # Create relationship
+            entities.append(
+                {
+                    "relationship_type": "RELATED_TO",
+                    "source": domain,
+                    "target": ns,
+                    "metadata": {"relationship": "dns_hosting"},
+                }
+            )
 
-        except Exception as e:
-            logger.error(f"Error getting nameservers for {domain}: {e}")
+        logger.info(f"Found {len(nameservers)} nameservers for {domain}")
 
         return entities
 
-    async def _detect_mail_servers(self, domain: str) -> List[Dict[str, Any]]:
-        """Detect mail servers from MX records"""
+    def _build_mx_entities(self, domain: str, answer: Any) -> List[Dict[str, Any]]:
+        """Build mail server entities from MX records"""
         entities = []
 
-        try:
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 10
-            resolver.lifetime = 10
-
-            answers = resolver.resolve(domain, "MX")
-
-            mail_servers = []
-            for rdata in answers:
-                priority = rdata.preference
-                server = str(rdata.exchange).rstrip(".")
-                mail_servers.append({"priority": priority, "server": server})
-
-            for ms in mail_servers:
-                entities.append(
-                    self._create_entity(
-                        entity_type="ORG",
-                        value=ms["server"],
-                        risk_level=RiskLevel.INFO,
-                        metadata={
-                            "type": "mail_server",
-                            "mx_priority": ms["priority"],
-                            "serves_domain": domain,
-                        },
-                    )
-                )
+        mail_servers = []
+        for rdata in answer:
+            # A null MX (RFC 7505) says the domain accepts no mail
+            if rdata.exchange == dns.name.root:
+                continue
+            priority = rdata.preference
+            server = rdata.exchange.to_text(omit_final_dot=True)
+            mail_servers.append({"priority": priority, "server": server})
 
-                # Create relationship
-                entities.append(
-                    {
-                        "relationship_type": "RELATED_TO",
-                        "source": domain,
-                        "target": ms["server"],
-                        "metadata": {"relationship": "mail_exchange"},
-                    }
+        for ms in mail_servers:
+            entities.append(
+                self._create_entity(
+                    entity_type="ORG",
+                    value=ms["server"],
+                    risk_level=RiskLevel.INFO,
+                    metadata={
+                        "type": "mail_server",
+                        "mx_priority": ms["priority"],
+                        "serves_domain": domain,
+                    },
                 )
+            )
 
-            logger.info(f"Found {len(mail_servers)} mail servers for {domain}")
+            # Create relationship
+            entities.append(
+                {
+                    "relationship_type": "RELATED_TO",
+                    "source": domain,
+                    "target": ms["server"],
+                    "metadata": {"relationship": "mail_exchange"},
+                }
+            )
 
-        except Exception as e:
-            logger.error(f"Error detecting mail servers for {domain}: {e}")
+        logger.info(f"Found {len(mail_servers)} mail servers for {domain}")
 
         return entities
 
@@ -433,5 +629,4 @@ class DomainCollector(BaseCollector):
         """Validate normalized data"""
         if isinstance(data, dict) and "relationship_type" in data:
             return True
-        required_fields = ["entity_type", "value"]
-        return all(field in data for field in required_fields)
+        return "entity_type" in data and "value" in data
@@ -14,13 +14,13 @@ import asyncio
 import re
 from typing import Any, Dict, List, Optional
 
-import dns.resolver
 from loguru import logger
 from validators import email as validate_email
 
 from app.collectors.base_collector import (BaseCollector, CollectionResult,
                                            CollectorConfig, DataType,
-                                           RiskLevel)
+                                           RiskLevel, get_shared_resolver,
+                                           highest_risk_level)
 
 
 class EmailCollector(BaseCollector):
@@ -82,15 +82,7 @@ class EmailCollector(BaseCollector):
                 result.data.extend(associated)
 
             # Determine overall risk level
-            risk_factors = [
-                e.get("risk_level", RiskLevel.INFO.value) for e in result.data
-            ]
-            if RiskLevel.CRITICAL.value in risk_factors:
-                result.risk_level = RiskLevel.CRITICAL
-            elif RiskLevel.HIGH.value in risk_factors:
-                result.risk_level = RiskLevel.HIGH
-            elif RiskLevel.MEDIUM.value in risk_factors:
-                result.risk_level = RiskLevel.MEDIUM
+            result.risk_level = highest_risk_level(result.data)
 
             result.success = len(result.errors) == 0
             result.metadata = {
@@ -115,12 +107,8 @@ class EmailCollector(BaseCollector):
             domain = email_address.split("@")[1]
 
             # Check MX records
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 10
-            resolver.lifetime = 10
-
             try:
-                mx_records = resolver.resolve(domain, "MX")
+                mx_records = await get_shared_resolver().resolve(domain, "MX")
                 mx_exists = len(mx_records) > 0
             except Exception:
                 mx_exists = False
@@ -289,7 +277,7 @@ class EmailCollector(BaseCollector):
 
             for platform, url in platforms:
                 try:
-                    await self._apply_rate_limit()
+                    await self._apply_rate_limit(url)
                     response = await self.session.get(url, timeout=10)
 
                     if response.status_code == 200:
@@ -383,15 +371,13 @@ class EmailCollector(BaseCollector):
                     variants.append(f"{parts[1]}.{parts[0]}@{domain}")  # last.first
 
             # Check which variants exist (have MX records)
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 5
-            resolver.lifetime = 5
+            resolver = get_shared_resolver()
 
             valid_variants = []
             for variant in variants:
                 try:
                     variant_domain = variant.split("@")[1]
-                    resolver.resolve(variant_domain, "MX")
+                    await resolver.resolve(variant_domain, "MX")
                     valid_variants.append(variant)
                 except Exception:
                     continue
@@ -435,5 +421,4 @@ class EmailCollector(BaseCollector):
         """Validate normalized data"""
         if isinstance(data, dict) and "relationship_type" in data:
             return True
-        required_fields = ["entity_type", "value"]
-        return all(field in data for field in required_fields)
+        return "entity_type" in data and "value" in data
@@ -115,7 +115,7 @@ class GeoCollector(BaseCollector):
 
         try:
             # Run blocking geocoding in thread pool
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
 
             location = await loop.run_in_executor(
                 None,
@@ -176,7 +176,7 @@ class GeoCollector(BaseCollector):
 
         try:
             # Run blocking geocoding in thread pool
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
 
             location = await loop.run_in_executor(
                 None,
@@ -395,5 +395,4 @@ class GeoCollector(BaseCollector):
         """Validate normalized data"""
         if isinstance(data, dict) and "relationship_type" in data:
             return True
-        required_fields = ["entity_type", "value"]
-        return all(field in data for field in required_fields)
+        return "entity_type" in data and "value" in data
@@ -22,7 +22,7 @@ from loguru import logger
 
 from app.collectors.base_collector import (BaseCollector, CollectionResult,
                                            CollectorConfig, DataType,
-                                           RiskLevel)
+                                           RiskLevel, highest_risk_level)
 
 
 class IPCollector(BaseCollector):
@@ -83,15 +83,7 @@ class IPCollector(BaseCollector):
                     result.data.extend(task_result)
 
             # Determine overall risk level
-            risk_factors = [
-                e.get("risk_level", RiskLevel.INFO.value) for e in result.data
-            ]
-            if RiskLevel.CRITICAL.value in risk_factors:
-                result.risk_level = RiskLevel.CRITICAL
-            elif RiskLevel.HIGH.value in risk_factors:
-                result.risk_level = RiskLevel.HIGH
-            elif RiskLevel.MEDIUM.value in risk_factors:
-                result.risk_level = RiskLevel.MEDIUM
+            result.risk_level = highest_risk_level(result.data)
 
             result.success = len(result.errors) == 0
             result.metadata = {
@@ -186,7 +178,7 @@ class IPCollector(BaseCollector):
             # Use nmap for port scanning
             # Note: This can be slow and may be detected
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
 
             async def run_nmap():
                 nm = nmap.PortScanner()
@@ -259,7 +251,7 @@ class IPCollector(BaseCollector):
 
         try:
             # Run in thread pool as it's blocking
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
 
             try:
                 hostname, _, _ = await loop.run_in_executor(
@@ -357,7 +349,7 @@ class IPCollector(BaseCollector):
             # Use whois command or library
             import whois
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             whois_data = await loop.run_in_executor(None, whois.whois, ip)
 
             if whois_data:
@@ -461,5 +453,4 @@ class IPCollector(BaseCollector):
         """Validate normalized data"""
         if isinstance(data, dict) and "relationship_type" in data:
             return True
-        required_fields = ["entity_type", "value"]
-        return all(field in data for field in required_fields)
+        return "entity_type" in data and "value" in data
@@ -24,7 +24,7 @@ from PIL import ExifTags, Image
 
 from app.collectors.base_collector import (BaseCollector, CollectionResult,
                                            CollectorConfig, DataType,
-                                           RiskLevel)
+                                           RiskLevel, highest_risk_level)
 
 
 class MediaCollector(BaseCollector):
@@ -94,15 +94,7 @@ class MediaCollector(BaseCollector):
                 pass
 
             # Determine overall risk level
-            risk_factors = [
-                e.get("risk_level", RiskLevel.INFO.value) for e in result.data
-            ]
-            if RiskLevel.CRITICAL.value in risk_factors:
-                result.risk_level = RiskLevel.CRITICAL
-            elif RiskLevel.HIGH.value in risk_factors:
-                result.risk_level = RiskLevel.HIGH
-            elif RiskLevel.MEDIUM.value in risk_factors:
-                result.risk_level = RiskLevel.MEDIUM
+            result.risk_level = highest_risk_level(result.data)
 
             result.success = len(result.errors) == 0
             result.metadata = {
@@ -461,8 +453,7 @@ class MediaCollector(BaseCollector):
 
     def validate(self, data: Dict[str, Any]) -> bool:
         """Validate normalized data"""
-        required_fields = ["entity_type", "value"]
-        return all(field in data for field in required_fields)
+        return "entity_type" in data and "value" in data
 
 
 # Import aiofiles at module level
@@ -128,7 +128,7 @@ class SocialCollector(BaseCollector):
 
         for platform, url in platform_urls.items():
             try:
-                await self._apply_rate_limit()
+                await self._apply_rate_limit(url)
 
                 response = await self.session.get(url, timeout=10)
 
@@ -340,7 +340,7 @@ class SocialCollector(BaseCollector):
 
         for platform, url in platforms_to_check:
             try:
-                await self._apply_rate_limit()
+                await self._apply_rate_limit(url)
                 response = await self.session.get(url, timeout=10)
 
                 if response.status_code == 200:
@@ -488,5 +488,4 @@ class SocialCollector(BaseCollector):
         """Validate normalized data"""
         if isinstance(data, dict) and "relationship_type" in data:
             return True
-        required_fields = ["entity_type", "value"]
-        return all(field in data for field in required_fields)
+        return "entity_type" in data and "value" in data
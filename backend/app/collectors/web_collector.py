@@ -18,16 +18,31 @@ import ssl
 import subprocess
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from urllib.parse import urljoin, urlparse
 
 import aiofiles
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from loguru import logger
 
 from app.collectors.base_collector import (BaseCollector, CollectionResult,
                                            CollectorConfig, DataType,
-                                           RiskLevel)
+                                           RiskLevel, get_shared_resolver)
+
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Only the tags _scrape_website reads are built into its tree
+_SCRAPE_TAGS = SoupStrainer(["title", "meta", "a", "h1", "h2", "h3"])
+
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+
+# Distinct addresses kept per page; footers and nav bars repeat the same ones
+MAX_PAGE_EMAILS = 100
 
 
 class WebCollector(BaseCollector):
@@ -80,6 +95,7 @@ class WebCollector(BaseCollector):
             "Apache": ["Server: Apache"],
             "Cloudflare": ["cf-ray", "cloudflare"],
         }
+        self._tech_automaton = self._build_signature_automaton()
 
     async def collect(self) -> CollectionResult:
         """
@@ -155,7 +171,7 @@ class WebCollector(BaseCollector):
             response.raise_for_status()
 
             html = response.text
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, "lxml", parse_only=_SCRAPE_TAGS)
 
             # Extract page title
             title = soup.find("title")
@@ -212,18 +228,15 @@ class WebCollector(BaseCollector):
             import dns.resolver
 
             discovered_subdomains = []
+            resolver = get_shared_resolver()
 
             # Check common subdomains
             for subdomain in self.common_subdomains:
                 try:
                     full_domain = f"{subdomain}.{domain}"
 
-                    resolver = dns.resolver.Resolver()
-                    resolver.timeout = 5
-                    resolver.lifetime = 5
-
                     # Try A record
-                    resolver.resolve(full_domain, "A")
+                    await resolver.resolve(full_domain, "A")
                     discovered_subdomains.append(full_domain)
 
                     await asyncio.sleep(0.5)  # Rate limiting
@@ -379,18 +392,19 @@ class WebCollector(BaseCollector):
             response.raise_for_status()
 
             html = response.text
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, "lxml")
 
-            # Email regex pattern
-            email_pattern = re.compile(
-                r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-            )
-
-            # Extract from text
-            emails = set(email_pattern.findall(soup.get_text()))
+            # Dedup while matching instead of materialising every repeat
+            emails: Set[str] = set()
+            for match in _EMAIL_RE.finditer(soup.get_text()):
+                emails.add(match.group(0))
+                if len(emails) >= MAX_PAGE_EMAILS:
+                    break
 
             # Extract from mailto links
             for link in soup.find_all("a", href=re.compile(r"^mailto:")):
+                if len(emails) >= MAX_PAGE_EMAILS:
+                    break
                 mailto = link["href"]
                 email = mailto.replace("mailto:", "").split("?")[0]
                 emails.add(email)
@@ -413,6 +427,40 @@ class WebCollector(BaseCollector):
 
         return entities
 
+    def _build_signature_automaton(self) -> Optional[Any]:
+        """Build an Aho-Corasick automaton over all lowercased tech signatures"""
+        if not AHOCORASICK_AVAILABLE:
+            return None
+
+        # A signature may belong to several technologies (e.g. "/static/")
+        techs_by_signature: Dict[str, List[str]] = {}
+        for tech, signatures in self.tech_signatures.items():
+            for sig in signatures:
+                techs_by_signature.setdefault(sig.lower(), []).append(tech)
+
+        automaton = ahocorasick.Automaton()
+        for sig, techs in techs_by_signature.items():
+            automaton.add_word(sig, tuple(techs))
+        automaton.make_automaton()
+
+        return automaton
+
+    def _match_signatures(self, text: str) -> Set[str]:
+        """
+        Find technologies with a signature in lowercased text.
+
+        With pyahocorasick all signatures are matched in a single pass over the
+        text instead of one substring search per signature.
+        """
+        if self._tech_automaton is not None:
+            return {tech for _, techs in self._tech_automaton.iter(text) for tech in techs}
+
+        return {
+            tech
+            for tech, signatures in self.tech_signatures.items()
+            if any(sig.lower() in text for sig in signatures)
+        }
+
     async def _detect_technologies(self, url: str) -> List[Dict[str, Any]]:
         """Detect CMS, frameworks, and server technologies"""
         entities = []
@@ -422,27 +470,20 @@ class WebCollector(BaseCollector):
             headers = dict(response.headers)
             html = response.text
 
-            detected_techs = []
-
             # Check server headers
             server = headers.get("Server", "").lower()
-            for tech, signatures in self.tech_signatures.items():
-                for sig in signatures:
-                    if sig.lower() in server:
-                        detected_techs.append(tech)
-                        break
+            server_techs = self._match_signatures(server)
 
             # Check HTML content
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, "lxml")
             page_text = soup.get_text().lower() + " " + html.lower()
+            page_techs = self._match_signatures(page_text)
 
-            for tech, signatures in self.tech_signatures.items():
-                if tech in detected_techs:
-                    continue
-                for sig in signatures:
-                    if sig.lower() in page_text:
-                        detected_techs.append(tech)
-                        break
+            # Server matches first, each group in signature table order
+            detected_techs = [t for t in self.tech_signatures if t in server_techs]
+            detected_techs += [
+                t for t in self.tech_signatures if t in page_techs and t not in server_techs
+            ]
 
             # Get domain from URL
             parsed_url = urlparse(url)
@@ -476,16 +517,14 @@ class WebCollector(BaseCollector):
         try:
             import dns.resolver
 
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 5
-            resolver.lifetime = 5
+            resolver = get_shared_resolver()
 
             record_types = ["A", "AAAA", "MX", "TXT", "NS", "CNAME", "SOA"]
             dns_records = {}
 
             for record_type in record_types:
                 try:
-                    answers = resolver.resolve(domain, record_type)
+                    answers = await resolver.resolve(domain, record_type)
                     dns_records[record_type] = [str(rdata) for rdata in answers]
                     await asyncio.sleep(0.3)
                 except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, Exception):
@@ -519,5 +558,4 @@ class WebCollector(BaseCollector):
 
     def validate(self, data: Dict[str, Any]) -> bool:
         """Validate normalized data"""
-        required_fields = ["entity_type", "value"]
-        return all(field in data for field in required_fields)
+        return "entity_type" in data and "value" in data
@@ -7,6 +7,7 @@ Handles ethical compliance for OSINT operations.
 import asyncio
 import re
 import time
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 from urllib.robotparser import RobotFileParser
@@ -14,6 +15,69 @@ from urllib.robotparser import RobotFileParser
 import httpx
 from loguru import logger
 
+try:
+    import hyperscan
+
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Basic sensitive data detection, matched against lowercased data in a single
+# pass; names are the reported issue types
+_PII_TYPES = ("ssn", "credit_card", "phone")
+_SENSITIVE_PATTERNS = (
+    ("ssn", r"\b\d{3}-\d{2}-\d{4}\b"),
+    ("credit_card", r"\b(?:4[0-9]{12}(?:[0-9]{3})?|5[1-5][0-9]{14}|3[47][0-9]{13})\b"),
+    ("phone", r"\b\d{3}-\d{3}-\d{4}\b"),
+    ("potential_api_key", r"api[_-]?key\s*[:=]\s*['\"][a-zA-Z0-9]{20,}['\"]"),
+)
+_SENSITIVE_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in _SENSITIVE_PATTERNS))
+
+
+def _compile_sensitive_database() -> Optional[Any]:
+    """Compile the sensitive patterns into one Hyperscan block-mode database"""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode() for _, pattern in _SENSITIVE_PATTERNS],
+            ids=list(range(len(_SENSITIVE_PATTERNS))),
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan unavailable for sensitive data scan: {e}")
+        return None
+
+
+_SENSITIVE_DB = _compile_sensitive_database()
+
+
+def _count_sensitive(text: str) -> Counter:
+    """
+    Count sensitive pattern matches in text, keyed by issue type.
+
+    Scans with the Hyperscan database when it compiled, otherwise with the
+    combined regex.
+    """
+    if _SENSITIVE_DB is None:
+        return Counter(match.lastgroup for match in _SENSITIVE_RE.finditer(text))
+
+    counts: Counter = Counter()
+
+    def on_match(pattern_id, start, end, flags, context):
+        counts[_SENSITIVE_PATTERNS[pattern_id][0]] += 1
+
+    _SENSITIVE_DB.scan(text.encode(), match_event_handler=on_match)
+    return counts
+
+
+_HONEYPOT_PATTERNS = tuple(
+    re.compile(pattern, re.I) for pattern in (r"honeypot", r"trap", r"canary", r"decoy")
+)
+_UNCOMMON_TLDS = (".tk", ".ml", ".ga", ".cf")
+
 
 class OSINTCompliance:
     """
@@ -223,15 +287,12 @@ class OSINTCompliance:
 
         try:
             # Check for suspicious patterns
-            suspicious_patterns = [r"honeypot", r"trap", r"canary", r"decoy"]
-
-            for pattern in suspicious_patterns:
-                if re.search(pattern, domain, re.I):
+            for pattern in _HONEYPOT_PATTERNS:
+                if pattern.search(domain):
                     indicators += 1
 
             # Check for unusual TLD
-            uncommon_tlds = [".tk", ".ml", ".ga", ".cf"]
-            if any(domain.endswith(tld) for tld in uncommon_tlds):
+            if domain.endswith(_UNCOMMON_TLDS):
                 indicators += 1
 
             # Check for excessive subdomains
@@ -271,17 +332,13 @@ class OSINTCompliance:
             # Convert data to string for analysis
             data_str = str(data).lower()
 
-            # PII patterns (basic detection)
-            pii_patterns = {
-                "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
-                "credit_card": r"\b(?:4[0-9]{12}(?:[0-9]{3})?|5[1-5][0-9]{14}|3[47][0-9]{13})\b",
-                "phone": r"\b\d{3}-\d{3}-\d{4}\b",
-            }
+            # Count every pattern in one scan over the data
+            counts = _count_sensitive(data_str)
 
-            for pii_type, pattern in pii_patterns.items():
-                matches = re.findall(pattern, data_str)
-                if matches:
-                    result["issues"].append({"type": pii_type, "count": len(matches), "severity": "HIGH"})
+            # PII patterns (basic detection)
+            for pii_type in _PII_TYPES:
+                if counts[pii_type]:
+                    result["issues"].append({"type": pii_type, "count": counts[pii_type], "severity": "HIGH"})
                     result["sensitive_data_detected"] = True
 
             # Check for passwords
@@ -290,22 +347,15 @@ class OSINTCompliance:
                 result["sensitive_data_detected"] = True
 
             # Check for API keys (basic pattern)
-            api_key_patterns = [
-                r"api[_-]?key\s*[:=]\s*['\"][a-zA-Z0-9]{20,}['\"]",
-                r"apikey\s*[:=]\s*['\"][a-zA-Z0-9]{20,}['\"]",
-            ]
-
-            for pattern in api_key_patterns:
-                matches = re.findall(pattern, data_str)
-                if matches:
-                    result["issues"].append(
-                        {
-                            "type": "potential_api_key",
-                            "count": len(matches),
-                            "severity": "HIGH",
-                        }
-                    )
-                    result["sensitive_data_detected"] = True
+            if counts["potential_api_key"]:
+                result["issues"].append(
+                    {
+                        "type": "potential_api_key",
+                        "count": counts["potential_api_key"],
+                        "severity": "HIGH",
+                    }
+                )
+                result["sensitive_data_detected"] = True
 
             # Determine if collection should be blocked
             if result["sensitive_data_detected"]:
@@ -289,6 +289,14 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error closing Neo4j connection: {e}")
     
+    try:
+        # Close pooled collector HTTP clients
+        from app.collectors.base_collector import close_shared_clients
+        await close_shared_clients()
+        logger.info("Collector HTTP clients closed")
+    except Exception as e:
+        logger.error(f"Error closing collector HTTP clients: {e}")
+    
     logger.info("Graceful shutdown complete")
 
 # Health check for Docker
@@ -17,6 +17,8 @@ from app.models.relationship import Relationship
 from app.risk_engine.exposure_models import ExposureAnalyzer
 from app.risk_engine.ml_models import RiskMLModel
 
+_SUSPICIOUS_TLDS = (".xyz", ".top", ".zip", ".tk")
+
 
 class RiskAnalyzer:
     """
@@ -459,7 +461,7 @@ class RiskAnalyzer:
         
         # Suspicious TLD
         value = entity.get("value", "").lower()
-        if any(value.endswith(tld) for tld in [".xyz", ".top", ".zip", ".tk"]):
+        if value.endswith(_SUSPICIOUS_TLDS):
             threat_score += 10
         
         return min(threat_score, 100)
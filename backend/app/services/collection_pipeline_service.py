@@ -5,10 +5,14 @@ Main orchestration service for OSINT data collection.
 """
 
 import asyncio
+import functools
+import re
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from pathlib import PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
 
 from loguru import logger
 
@@ -23,6 +27,41 @@ from app.services.graph_service import GraphService
 from app.services.normalization_service import NormalizationService
 from app.services.risk_analysis_service import RiskAnalysisService
 
+_COORD_RE = re.compile(r"[-+]?\d+\.\d+\s*,\s*[-+]?\d+\.\d+")
+_ADDRESS_RE = re.compile(r"\b(?:street|avenue|road|city|state|country|zip)\b", re.IGNORECASE)
+_MEDIA_EXTENSIONS = frozenset(
+    {".jpg", ".jpeg", ".png", ".gif", ".mp3", ".wav", ".mp4", ".avi", ".mov"}
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_coordinate_pair(target: str) -> bool:
+    """Check if target is a "lat, lon" coordinate pair"""
+    return bool(_COORD_RE.fullmatch(target.strip()))
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_address(target: str) -> bool:
+    """Check if free text mentions a postal address keyword"""
+    return bool(_ADDRESS_RE.search(target))
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_media_target(target: str) -> bool:
+    """
+    Check if a URL or path target points to an image, audio or video file.
+
+    Bare names are never media: extensions such as .mov are also TLDs, so
+    example.mov is a domain.
+    """
+    if "://" in target:
+        path = urlparse(target).path
+    elif "/" in target:
+        path = target
+    else:
+        return False
+    return PurePosixPath(path).suffix.lower() in _MEDIA_EXTENSIONS
+
 
 class TaskStatus(Enum):
     """Collection task statuses"""
@@ -141,37 +180,7 @@ class CollectionPipelineService:
 
             results = await self.execute_collection(target, collectors, task_id)
 
-            # Process results
-            logger.info(f"Task {task_id}: Collection complete, processing results")
-
-            normalized_data = await self.normalize_results(results)
-
-            # Create entities and relationships
-            logger.info(f"Task {task_id}: Creating entities and relationships")
-
-            if self.entity_service:
-                created_data = await self.create_entities_from_results(
-                    normalized_data, task_id
-                )
-            else:
-                # If no DB, just use normalized data
-                created_data = {
-                    "entities": normalized_data.get("entities", []),
-                    "relationships": normalized_data.get("relationships", []),
-                }
-
-            # Sync to Neo4j
-            logger.info(f"Task {task_id}: Syncing to Neo4j")
-
-            if self.graph_service:
-                await self.sync_to_neo4j(
-                    created_data["entities"], created_data["relationships"]
-                )
-
-            # Assess risk
-            logger.info(f"Task {task_id}: Assessing risk")
-
-            await self.assess_risk(created_data["entities"])
+            created_data = await self.process_results(results, task_id)
 
             # Update task status
             task["status"] = TaskStatus.COMPLETED.value
@@ -217,6 +226,11 @@ class CollectionPipelineService:
         # Infer data type
         data_type = infer_data_type(target)
         logger.info(f"Inferred data type for {target}: {data_type.value}")
+        is_media = data_type in [
+            DataType.IMAGE,
+            DataType.AUDIO,
+            DataType.VIDEO,
+        ] or _is_media_target(target)
 
         # If specific types requested, use them
         if collection_types:
@@ -254,7 +268,12 @@ class CollectionPipelineService:
             try:
                 config = CollectorConfig(target=target, data_type=data_type)
 
-                if data_type == DataType.URL:
+                if _is_coordinate_pair(target):
+                    config.data_type = DataType.TEXT
+                    collectors.append(GeoCollector(config))
+                elif is_media:
+                    collectors.append(MediaCollector(config))
+                elif data_type == DataType.URL:
                     collectors.append(WebCollector(config))
                 elif data_type == DataType.DOMAIN:
                     collectors.append(DomainCollector(config))
@@ -262,10 +281,12 @@ class CollectionPipelineService:
                     collectors.append(IPCollector(config))
                 elif data_type == DataType.EMAIL:
                     collectors.append(EmailCollector(config))
+                elif data_type in [DataType.USERNAME, DataType.TEXT] and _is_address(target):
+                    # Only free text can be an address; hosts like state.gov are not
+                    config.data_type = DataType.TEXT
+                    collectors.append(GeoCollector(config))
                 elif data_type in [DataType.USERNAME, DataType.SOCIAL_PROFILE]:
                     collectors.append(SocialCollector(config))
-                elif data_type in [DataType.IMAGE, DataType.AUDIO, DataType.VIDEO]:
-                    collectors.append(MediaCollector(config))
 
             except Exception as e:
                 logger.error(f"Failed to create collector for {data_type}: {e}")
@@ -279,11 +300,7 @@ class CollectionPipelineService:
                 logger.error(f"Failed to create dark web collector: {e}")
 
         # Add media collector if requested and not already added
-        if include_media and data_type not in [
-            DataType.IMAGE,
-            DataType.AUDIO,
-            DataType.VIDEO,
-        ]:
+        if include_media and not is_media:
             try:
                 config = CollectorConfig(target=target, data_type=DataType.TEXT)
                 collectors.append(MediaCollector(config))
@@ -355,29 +372,80 @@ class CollectionPipelineService:
 
         return results
 
-    async def normalize_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def process_results(
+        self, results: Iterable[Dict[str, Any]], task_id: str
+    ) -> Dict[str, Any]:
         """
-        Normalize, deduplicate, and validate collected data.
+        Normalize collection results, persist them, sync to Neo4j and assess risk.
 
         Args:
-            results: List of collection results
+            results: Collection results (any iterable)
+            task_id: Task ID for tracking
 
         Returns:
-            Normalized data with entities and relationships
+            Created data with entities and relationships
         """
-        logger.info(f"Normalizing {len(results)} collection results")
+        # Process results
+        logger.info(f"Task {task_id}: Collection complete, processing results")
+
+        normalized_data = await self.normalize_results(results)
+
+        # Create entities and relationships
+        logger.info(f"Task {task_id}: Creating entities and relationships")
+
+        if self.entity_service:
+            created_data = await self.create_entities_from_results(
+                normalized_data, task_id
+            )
+        else:
+            # If no DB, just use normalized data
+            created_data = {
+                "entities": normalized_data.get("entities", []),
+                "relationships": normalized_data.get("relationships", []),
+            }
+
+        # Sync to Neo4j
+        logger.info(f"Task {task_id}: Syncing to Neo4j")
+
+        if self.graph_service:
+            await self.sync_to_neo4j(
+                created_data["entities"], created_data["relationships"]
+            )
 
-        # Extract all entities and relationships from results
-        all_data = []
+        # Assess risk
+        logger.info(f"Task {task_id}: Assessing risk")
 
-        for result in results:
-            if isinstance(result, dict):
-                # Add entities
-                if "data" in result and isinstance(result["data"], list):
-                    all_data.extend(result["data"])
+        await self.assess_risk(created_data["entities"])
+
+        return created_data
+
+    async def normalize_results(self, results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Normalize, deduplicate, and validate collected data.
+
+        Results are consumed one at a time and merged straight into the
+        deduplication index, so only one collector's output plus the unique
+        entities are held at once.
+
+        Args:
+            results: Collection results (any iterable)
+
+        Returns:
+            Normalized data with entities and relationships
+        """
+        logger.info("Normalizing collection results")
+
+        # Stream all entities and relationships from results into dedup
+        entity_stream = (
+            item
+            for result in results
+            if isinstance(result, dict) and isinstance(result.get("data"), list)
+            for item in result["data"]
+        )
+        deduplicated = self.normalization_service.deduplicate_entities(entity_stream)
 
-        # Batch normalize
-        normalized = await self.normalization_service.batch_normalize(all_data)
+        # Batch normalize, skipping the deduplication done above
+        normalized = await self.normalization_service.batch_normalize(deduplicated, deduplicate=False)
 
         # Separate entities and relationships
         separated = self.normalization_service.normalize_for_storage(normalized)
@@ -8,7 +8,7 @@ Uses Pandas and Dask for processing.
 import hashlib
 import re
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 from urllib.parse import urlparse
 
 import pandas as pd
@@ -16,6 +16,59 @@ from loguru import logger
 
 from app.collectors.base_collector import DataType, RiskLevel
 
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_IP_RE = re.compile(r"^(\d{1,3}\.){3}\d{1,3}$")
+_DOMAIN_RE = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9-]{0,61}[a-zA-Z0-9]?(\.[a-zA-Z]{2,})+$")
+
+_RISK_PRIORITY = {
+    RiskLevel.CRITICAL.value: 5,
+    RiskLevel.HIGH.value: 4,
+    RiskLevel.MEDIUM.value: 3,
+    RiskLevel.LOW.value: 2,
+    RiskLevel.INFO.value: 1,
+}
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix"""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _enrich_email(value: str, metadata: Dict[str, Any]) -> None:
+    parts = value.split("@")
+    if len(parts) == 2:
+        metadata["local_part"] = parts[0]
+        metadata["domain"] = parts[1]
+
+
+def _enrich_domain(value: str, metadata: Dict[str, Any]) -> None:
+    # Extract domain parts
+    domain_parts = value.split(".")
+    if len(domain_parts) >= 2:
+        metadata["tld"] = domain_parts[-1]
+        metadata["sld"] = domain_parts[-2]
+        if len(domain_parts) > 2:
+            metadata["subdomain"] = ".".join(domain_parts[:-2])
+
+
+def _enrich_url(value: str, metadata: Dict[str, Any]) -> None:
+    try:
+        parsed = urlparse(value)
+        metadata["scheme"] = parsed.scheme
+        metadata["netloc"] = parsed.netloc
+        metadata["path"] = parsed.path
+        metadata["query"] = parsed.query
+    except Exception:
+        pass
+
+
+# Type-specific enrichment, keyed by entity_type
+_TYPE_ENRICHERS: Dict[str, Callable[[str, Dict[str, Any]], None]] = {
+    DataType.EMAIL.value: _enrich_email,
+    DataType.DOMAIN.value: _enrich_domain,
+    DataType.URL.value: _enrich_url,
+}
+
 
 class NormalizationService:
     """
@@ -34,56 +87,53 @@ class NormalizationService:
         self.processed_hashes: Set[str] = set()
 
     def deduplicate_entities(
-        self, entities: List[Dict[str, Any]]
+        self, entities: Iterable[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """
         Remove duplicate entities by value and type.
 
         Args:
-            entities: List of entity dictionaries
+            entities: Entity dictionaries (any iterable, consumed in a single pass)
 
         Returns:
             Deduplicated list of entities
         """
-        if not entities:
-            return []
+        # Single streaming pass keyed by (entity_type, value) tuples.
+        # Keep the one with highest risk level and only merge metadata
+        # when a collision actually occurs.
+        unique_entities: Dict[tuple, Dict[str, Any]] = {}
+        total = 0
 
-        logger.info(f"Deduplicating {len(entities)} entities")
+        for entity in entities:
+            total += 1
+            key = (entity.get("entity_type"), entity.get("value"))
+            existing = unique_entities.get(key)
 
-        # Create DataFrame for efficient processing
-        df = pd.DataFrame(entities)
+            if existing is None:
+                unique_entities[key] = entity
+                continue
 
-        # Deduplicate by entity_type and value
-        # Keep the one with highest risk level
-        risk_priority = {
-            RiskLevel.CRITICAL.value: 5,
-            RiskLevel.HIGH.value: 4,
-            RiskLevel.MEDIUM.value: 3,
-            RiskLevel.LOW.value: 2,
-            RiskLevel.INFO.value: 1,
-        }
-
-        if "risk_level" in df.columns:
-            df["risk_priority"] = df["risk_level"].map(risk_priority).fillna(0)
-        else:
-            df["risk_priority"] = 0
-
-        # Sort by risk priority (descending)
-        df_sorted = df.sort_values("risk_priority", ascending=False)
-
-        # Drop duplicates, keeping first (highest risk)
-        df_deduplicated = df_sorted.drop_duplicates(
-            subset=["entity_type", "value"], keep="first"
-        )
+            if _RISK_PRIORITY.get(entity.get("risk_level"), 0) > _RISK_PRIORITY.get(
+                existing.get("risk_level"), 0
+            ):
+                existing, entity = entity, existing
+                unique_entities[key] = existing
 
-        # Convert back to list of dicts
-        deduplicated = df_deduplicated.drop(columns=["risk_priority"]).to_dict(
-            "records"
-        )
+            metadata = entity.get("metadata")
+            if metadata and isinstance(metadata, dict):
+                merged = dict(metadata)
+                if isinstance(existing.get("metadata"), dict):
+                    merged |= existing["metadata"]
+                unique_entities[key] = {**existing, "metadata": merged}
+
+        if not total:
+            return []
+
+        deduplicated = list(unique_entities.values())
 
         logger.info(
-            f"Deduplicated to {len(deduplicated)} entities "
-            f"({len(entities) - len(deduplicated)} removed)"
+            f"Deduplicated {total} entities to {len(deduplicated)} "
+            f"({total - len(deduplicated)} removed)"
         )
 
         return deduplicated
@@ -142,14 +192,7 @@ class NormalizationService:
         # Keep highest risk level
         risk_levels = group["risk_level"].dropna().tolist()
         if risk_levels:
-            risk_priority = {
-                RiskLevel.CRITICAL.value: 5,
-                RiskLevel.HIGH.value: 4,
-                RiskLevel.MEDIUM.value: 3,
-                RiskLevel.LOW.value: 2,
-                RiskLevel.INFO.value: 1,
-            }
-            highest_risk = max(risk_levels, key=lambda x: risk_priority.get(x, 0))
+            highest_risk = max(risk_levels, key=lambda x: _RISK_PRIORITY.get(x, 0))
             result["risk_level"] = highest_risk
 
         return result
@@ -185,28 +228,29 @@ class NormalizationService:
         value = str(entity["value"])
 
         if entity_type == DataType.EMAIL.value:
-            if not re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", value):
+            if not _EMAIL_RE.match(value):
                 return False
 
         elif entity_type == DataType.IP.value:
-            ip_pattern = r"^(\d{1,3}\.){3}\d{1,3}$"
-            if not re.match(ip_pattern, value):
+            if not _IP_RE.match(value):
                 return False
 
         elif entity_type == DataType.DOMAIN.value:
-            if not re.match(
-                r"^[a-zA-Z0-9][a-zA-Z0-9-]{0,61}[a-zA-Z0-9]?(\.[a-zA-Z]{2,})+$", value
-            ):
+            if not _DOMAIN_RE.match(value):
                 return False
 
         return True
 
-    def enrich_entity_metadata(self, entity: Dict[str, Any]) -> Dict[str, Any]:
+    def enrich_entity_metadata(
+        self, entity: Dict[str, Any], normalized_at: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Add additional computed fields to entity.
 
         Args:
             entity: Entity dictionary to enrich
+            normalized_at: Normalization timestamp shared by a batch
+                (current time if None)
 
         Returns:
             Enriched entity
@@ -217,37 +261,19 @@ class NormalizationService:
         metadata = entity["metadata"]
 
         # Add normalized timestamp
-        metadata["normalized_at"] = datetime.utcnow().isoformat() + "Z"
+        metadata["normalized_at"] = normalized_at or _utc_timestamp()
 
-        # Add hash for easy comparison
+        # Add hash for easy comparison (stable across processes, same
+        # 32 hex digit width as the former MD5)
         value_str = str(entity["value"]).lower()
-        entity["value_hash"] = hashlib.md5(value_str.encode()).hexdigest()
+        entity["value_hash"] = hashlib.blake2b(
+            value_str.encode("utf-8", "ignore"), digest_size=16
+        ).hexdigest()
 
         # Type-specific enrichment
-        if entity["entity_type"] == DataType.EMAIL.value:
-            parts = entity["value"].split("@")
-            if len(parts) == 2:
-                metadata["local_part"] = parts[0]
-                metadata["domain"] = parts[1]
-
-        elif entity["entity_type"] == DataType.DOMAIN.value:
-            # Extract domain parts
-            domain_parts = entity["value"].split(".")
-            if len(domain_parts) >= 2:
-                metadata["tld"] = domain_parts[-1]
-                metadata["sld"] = domain_parts[-2]
-                if len(domain_parts) > 2:
-                    metadata["subdomain"] = ".".join(domain_parts[:-2])
-
-        elif entity["entity_type"] == DataType.URL.value:
-            try:
-                parsed = urlparse(entity["value"])
-                metadata["scheme"] = parsed.scheme
-                metadata["netloc"] = parsed.netloc
-                metadata["path"] = parsed.path
-                metadata["query"] = parsed.query
-            except Exception:
-                pass
+        enricher = _TYPE_ENRICHERS.get(entity["entity_type"])
+        if enricher is not None:
+            enricher(entity["value"], metadata)
 
         return entity
 
@@ -306,7 +332,10 @@ class NormalizationService:
         return entities
 
     async def batch_normalize(
-        self, entity_list: List[Dict[str, Any]], batch_size: int = 1000
+        self,
+        entity_list: List[Dict[str, Any]],
+        batch_size: int = 1000,
+        deduplicate: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         Parallel batch processing with Dask.
@@ -314,6 +343,7 @@ class NormalizationService:
         Args:
             entity_list: List of entities to normalize
             batch_size: Number of entities per batch
+            deduplicate: Deduplicate first; pass False for already deduplicated input
 
         Returns:
             List of normalized entities
@@ -329,7 +359,7 @@ class NormalizationService:
         # For very large datasets, would use Dask
 
         # Step 1: Deduplicate
-        deduplicated = self.deduplicate_entities(entity_list)
+        deduplicated = self.deduplicate_entities(entity_list) if deduplicate else entity_list
 
         # Step 2: Merge data
         merged = self.merge_entity_data(deduplicated)
@@ -342,8 +372,11 @@ class NormalizationService:
                 f"Filtered out {len(merged) - len(valid_entities)} invalid entities"
             )
 
-        # Step 4: Enrich metadata
-        enriched = [self.enrich_entity_metadata(e) for e in valid_entities]
+        # Step 4: Enrich metadata (one timestamp for the whole batch)
+        normalized_at = _utc_timestamp()
+        enriched = [
+            self.enrich_entity_metadata(e, normalized_at) for e in valid_entities
+        ]
 
         # Step 5: Normalize timestamps
         normalized = self.normalize_timestamps(enriched)
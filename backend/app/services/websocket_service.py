@@ -14,9 +14,41 @@ from typing import Any, Dict, List, Optional, Set
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logger = logging.getLogger("reconvault.services.websocket")
 
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+def _dumps(message: Dict[str, Any]) -> str:
+    """
+    Serialize a message for sending over a WebSocket.
+
+    Uses orjson when available; it is several times faster than the stdlib
+    encoder on large entity payloads. Datetimes and dataclasses are passed
+    through to default=str so the wire format does not depend on which
+    encoder is installed.
+
+    Args:
+        message: Message to serialize
+
+    Returns:
+        str: JSON text
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, default=str, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(message, default=str)
+
 
 class ConnectionManager:
     """
@@ -137,7 +169,7 @@ class ConnectionManager:
                 self.connection_metadata[connection_id]["message_count"] += 1
 
             # Send message
-            message_str = json.dumps(message, default=str)
+            message_str = _dumps(message)
             await websocket.send_text(message_str)
             return True
 
@@ -167,7 +199,7 @@ class ConnectionManager:
         failed_connections = []
 
         # Create message once
-        message_str = json.dumps(message, default=str)
+        message_str = _dumps(message)
 
         for connection_id, websocket in list(self.active_connections.items()):
             if connection_id in exclude_connection_ids:
@@ -0,0 +1,52 @@
+"""
+Unit tests for the collection pipeline service.
+
+Tests cover:
+- Auto-routing of targets to collectors
+"""
+import pytest
+
+from app.services.collection_pipeline_service import CollectionPipelineService
+
+
+class TestRouteToCollectors:
+    """Tests for CollectionPipelineService.route_to_collectors."""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Pipeline service instance."""
+        return CollectionPipelineService()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "target,collectors",
+        [
+            ("40.7128, -74.0060", ["GeoCollector"]),
+            ("221B Baker Street", ["GeoCollector"]),
+            ("state.gov", ["DomainCollector"]),
+            ("city.com", ["DomainCollector"]),
+            ("zip.com", ["DomainCollector"]),
+            ("new-york-city.org", ["DomainCollector"]),
+            ("john@city.gov", ["EmailCollector"]),
+            ("https://example.com/city/", ["WebCollector"]),
+        ],
+    )
+    async def test_geo_routing(self, pipeline, target, collectors):
+        """Test only coordinates and free-text addresses go to GeoCollector."""
+        routed = await pipeline.route_to_collectors(target)
+        assert [type(collector).__name__ for collector in routed] == collectors
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "target,collectors",
+        [
+            ("example.mov", ["DomainCollector"]),
+            ("https://example.com/clip.mov", ["MediaCollector"]),
+            ("cdn.example.com/photos/IMG_01.JPG", ["MediaCollector"]),
+            ("https://example.mov/", ["WebCollector"]),
+        ],
+    )
+    async def test_media_routing(self, pipeline, target, collectors):
+        """Test only URL and path targets are matched on media extensions."""
+        routed = await pipeline.route_to_collectors(target)
+        assert [type(collector).__name__ for collector in routed] == collectors
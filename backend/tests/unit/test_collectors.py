@@ -14,8 +14,16 @@ Tests cover:
 - Data validation
 """
 import asyncio
+import json
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from urllib.robotparser import RobotFileParser
 
+import dns.exception
+import dns.resolver
+import dns.rrset
+import httpx
 import pytest
 from faker import Faker
 
@@ -26,15 +34,40 @@ from app.collectors import (
     DataType,
     RiskLevel,
     UserAgentRotator,
+    infer_data_type,
+    infer_data_types,
+)
+from app.collectors import domain_collector as domain_collector_module
+from app.collectors.base_collector import (
+    _HOST_NEXT_SLOT,
+    _ROBOTS_CACHE,
+    _RobotsRules,
+    close_shared_clients,
+    get_shared_resolver,
+    highest_risk_level,
+)
+from app.collectors.darkweb_collector import (ONION_EXTRACT_CONCURRENCY,
+                                              SEARCH_ENGINES,
+                                              TOR_ISOLATION_SLOTS,
+                                              TOR_KEEPALIVE_EXPIRY,
+                                              _ONION_CACHE, _SEARCH_CACHE,
+                                              DarkWebCollector,
+                                              _isolated_proxy_url,
+                                              _tor_circuit_established)
+from app.collectors.domain_collector import (
+    DNS_CACHE_MIN_TTL,
+    DNS_RECORD_TYPES,
+    WHOIS_PER_TLD_CONCURRENCY,
+    _DNS_CACHE,
+    _WHOIS_CACHE,
+    DomainCollector,
 )
-from app.collectors.darkweb_collector import DarkWebCollector
-from app.collectors.domain_collector import DomainCollector
 from app.collectors.email_collector import EmailCollector
 from app.collectors.geo_collector import GeoCollector
 from app.collectors.ip_collector import IPCollector
 from app.collectors.media_collector import MediaCollector
 from app.collectors.social_collector import SocialCollector
-from app.collectors.web_collector import WebCollector
+from app.collectors.web_collector import MAX_PAGE_EMAILS, WebCollector
 
 fake = Faker()
 
@@ -77,12 +110,110 @@ class TestBaseCollector:
         # Should cycle through available agents
         assert agents[0] == agents[5]  # After 5 agents, cycle repeats
 
+    @pytest.mark.parametrize(
+        "levels,expected",
+        [
+            ([], RiskLevel.INFO),
+            (["INFO", None, "LOW"], RiskLevel.LOW),
+            (["MEDIUM", "CRITICAL", "HIGH"], RiskLevel.CRITICAL),
+            (["HIGH", "bogus"], RiskLevel.HIGH),
+        ],
+    )
+    def test_highest_risk_level(self, levels, expected):
+        """Test the most severe entity risk level wins; relationships count as INFO."""
+        entities = [{"risk_level": level} if level else {"relationship_type": "RELATED_TO"} for level in levels]
+        assert highest_risk_level(entities) is expected
+
     def test_user_agent_rotator_random(self):
         """Test UserAgentRotator random selection."""
         rotator = UserAgentRotator()
         agent = rotator.get_random_user_agent()
         assert agent in UserAgentRotator.USER_AGENTS
 
+    @pytest.mark.asyncio
+    async def test_collectors_share_pooled_client(self):
+        """Test collectors with the same transport settings share one client."""
+        first = WebCollector(CollectorConfig(target="example.com", data_type=DataType.URL))
+        second = DomainCollector(CollectorConfig(target="example.com", data_type=DataType.DOMAIN))
+
+        async with first, second:
+            assert first.session is second.session
+
+        assert not first.session
+        await close_shared_clients()
+
+    @pytest.mark.asyncio
+    async def test_robots_txt_fetched_once_per_host(self):
+        """Test robots.txt is shared across collectors and fetched once per host."""
+        _ROBOTS_CACHE.clear()
+        response = Mock(status_code=200, text="User-agent: *\nDisallow: /private")
+        session = Mock(get=AsyncMock(return_value=response))
+
+        collectors = [
+            WebCollector(CollectorConfig(target="example.com", data_type=DataType.URL, session=session))
+            for _ in range(3)
+        ]
+        for collector in collectors:
+            collector.session = session
+
+        results = await asyncio.gather(
+            *(c._check_robots_txt("https://example.com/private", "/private") for c in collectors)
+        )
+
+        assert results == [False, False, False]
+        assert session.get.await_count == 1
+        _ROBOTS_CACHE.clear()
+
+    def test_compiled_robots_rules_match_robotparser(self):
+        """Test compiled robots.txt rules agree with RobotFileParser."""
+        parser = RobotFileParser()
+        parser.parse(
+            [
+                "User-agent: badbot",
+                "Disallow: /",
+                "",
+                "User-agent: *",
+                "Allow: /private/public",
+                "Disallow: /private",
+                "Disallow: /search?q=",
+            ]
+        )
+        rules = _RobotsRules(parser)
+
+        for user_agent in ("*", "badbot/2.1", "Mozilla/5.0"):
+            for path in ("/", "/private", "/private/public/x", "/search?q=a", "/search"):
+                assert rules.can_fetch(user_agent, path) == parser.can_fetch(user_agent, path)
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_is_per_host(self):
+        """Test requests are spaced per destination host, across collectors."""
+        _HOST_NEXT_SLOT.clear()
+        config = CollectorConfig(target="example.com", data_type=DataType.URL, rate_limit=2.0)
+        first, second = WebCollector(config), WebCollector(config)
+
+        with patch("app.collectors.base_collector.asyncio.sleep", new=AsyncMock()) as sleep:
+            await first._apply_rate_limit("https://github.com/a")
+            await second._apply_rate_limit("https://reddit.com/user/a")
+            sleep.assert_not_awaited()
+
+            await second._apply_rate_limit("https://github.com/b")
+            sleep.assert_awaited_once()
+            assert sleep.await_args.args[0] == pytest.approx(2.0, abs=0.1)
+
+        _HOST_NEXT_SLOT.clear()
+
+    def test_collection_result_to_bytes(self):
+        """Test CollectionResult serializes to JSON bytes."""
+        result = CollectionResult(
+            success=True,
+            data=[{"entity_type": "domain", "value": "example.com"}],
+            risk_level=RiskLevel.HIGH,
+        )
+        decoded = json.loads(result.to_bytes())
+        assert decoded["success"] is True
+        assert decoded["risk_level"] == "HIGH"
+        assert decoded["data"][0]["value"] == "example.com"
+
     def test_data_type_enum(self):
         """Test DataType enum values."""
         assert DataType.DOMAIN.value == "domain"
@@ -144,6 +275,42 @@ class TestWebCollector:
         result = await web_collector.collect()
         assert result.success is True
 
+    @pytest.mark.asyncio
+    async def test_detect_technologies(self, web_collector):
+        """Test server and page signatures are detected in signature table order."""
+        response = Mock(
+            headers={"Server": "nginx/1.25"},
+            text='<link href="/wp-content/x.css"><script src="/static/app.js"></script>',
+        )
+        web_collector.session = Mock(get=AsyncMock(return_value=response))
+
+        entities = await web_collector._detect_technologies("https://example.com")
+
+        assert entities[0]["metadata"]["technologies"] == ["WordPress", "Django", "Flask"]
+
+    @pytest.mark.asyncio
+    async def test_extract_emails_dedups_and_caps(self, web_collector):
+        """Test repeated addresses yield one entity and distinct ones stop at the cap."""
+        footer = "<p>contact@example.com</p>\n" * 50
+        many = "".join(f"<p>user{i}@example.com</p>\n" for i in range(MAX_PAGE_EMAILS + 20))
+        response = Mock(text=f"<html><body>{footer}{many}</body></html>", raise_for_status=Mock())
+        web_collector.session = Mock(get=AsyncMock(return_value=response))
+
+        entities = await web_collector._extract_emails("https://example.com")
+
+        values = [e["value"] for e in entities]
+        assert len(values) == MAX_PAGE_EMAILS
+        assert values.count("contact@example.com") == 1
+
+    def test_match_signatures_matches_substring_scan(self, web_collector):
+        """Test the Aho-Corasick matcher agrees with per-signature substring checks."""
+        text = "cf-ray: 1 <div id=__next> /storage/ laravel_session ng-app".lower()
+        fallback = web_collector._match_signatures.__func__(
+            Mock(tech_signatures=web_collector.tech_signatures, _tech_automaton=None), text
+        )
+        assert web_collector._match_signatures(text) == fallback
+        assert fallback == {"Cloudflare", "Next.js", "Laravel", "Angular"}
+
     @pytest.mark.asyncio
     @patch("httpx.AsyncClient.get")
     async def test_web_collector_404_error(self, mock_get, web_collector):
@@ -200,6 +367,8 @@ class TestDomainCollector:
     @pytest.fixture
     def domain_collector(self, domain_config):
         """Domain collector instance."""
+        _DNS_CACHE.clear()
+        _WHOIS_CACHE.clear()
         return DomainCollector(domain_config)
 
     @pytest.mark.asyncio
@@ -241,6 +410,211 @@ class TestDomainCollector:
         result = await domain_collector.collect()
         assert result.success is False
 
+    @pytest.mark.asyncio
+    async def test_dns_lookups_resolve_each_type_once_concurrently(self, domain_collector):
+        """Test one concurrent pass over the record types feeds every DNS entity."""
+        answers = {
+            "A": ["93.184.216.34"],
+            "NS": ["a.iana-servers.net."],
+            "MX": ["10 mail.example.com.", "0 ."],
+        }
+
+        async def resolve(domain, record_type, raise_on_no_answer=True):
+            await asyncio.sleep(0.05)
+            if record_type not in answers:
+                assert raise_on_no_answer is False
+                return Mock(rrset=None)
+            rrset = dns.rrset.from_text(domain, 300, "IN", record_type, *answers[record_type])
+            return Mock(rrset=rrset, __iter__=lambda self: iter(rrset))
+
+        with patch.object(get_shared_resolver(), "resolve", side_effect=resolve) as mock_resolve:
+            started = time.monotonic()
+            entities = await domain_collector._dns_lookups("example.com")
+
+        assert time.monotonic() - started < 0.05 * len(DNS_RECORD_TYPES) / 2
+        assert sorted(call.args[1] for call in mock_resolve.call_args_list) == sorted(DNS_RECORD_TYPES)
+        assert entities[0]["metadata"]["dns_records"] == {
+            "A": ["93.184.216.34"],
+            "NS": ["a.iana-servers.net."],
+            "MX": ["10 mail.example.com.", "0 ."],
+        }
+        servers = {e["value"]: e["metadata"]["type"] for e in entities[1:] if "entity_type" in e}
+        assert servers == {"a.iana-servers.net": "nameserver", "mail.example.com": "mail_server"}
+
+    @pytest.mark.asyncio
+    async def test_dns_answers_cached_for_record_ttl(self, domain_collector):
+        """Test answers, including missing records, are reused within their TTL."""
+        rrset = dns.rrset.from_text("example.com", 5, "IN", "A", "93.184.216.34")
+
+        async def resolve(domain, record_type, raise_on_no_answer=True):
+            await asyncio.sleep(0.01)
+            if record_type != "A":
+                return Mock(rrset=None)
+            return Mock(rrset=rrset, __iter__=lambda self: iter(rrset))
+
+        with patch.object(get_shared_resolver(), "resolve", side_effect=resolve) as mock_resolve:
+            first, second = await asyncio.gather(
+                domain_collector._dns_all("example.com"), domain_collector._dns_all("EXAMPLE.com")
+            )
+            await domain_collector._dns_all("example.com")
+
+        assert mock_resolve.call_count == len(DNS_RECORD_TYPES)
+        assert first.keys() == second.keys() == {"A"}
+        expires_at, _ = _DNS_CACHE[("example.com", "A")]
+        assert expires_at - time.monotonic() == pytest.approx(DNS_CACHE_MIN_TTL, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_dns_failures_not_cached(self, domain_collector):
+        """Test a timed-out query is retried by the next lookup."""
+        with patch.object(
+            get_shared_resolver(), "resolve", side_effect=dns.exception.Timeout()
+        ) as mock_resolve:
+            await domain_collector._dns_all("example.com")
+            await domain_collector._dns_all("example.com")
+
+        assert mock_resolve.call_count == 2 * len(DNS_RECORD_TYPES)
+        assert not _DNS_CACHE
+
+    @pytest.mark.asyncio
+    async def test_resolve_races_fastest_nameservers(self, monkeypatch):
+        """Test the fastest-ranked nameservers race, the first reply wins and losers are cancelled."""
+        delays = {"10.0.0.1": 0.2, "10.0.0.2": 0.01, "10.0.0.3": 0.05, "10.0.0.4": 0.05}
+        cancelled = []
+
+        def resolver_for(nameserver):
+            async def resolve(domain, record_type, raise_on_no_answer=True):
+                try:
+                    await asyncio.sleep(delays[nameserver])
+                except asyncio.CancelledError:
+                    cancelled.append(nameserver)
+                    raise
+                return nameserver
+
+            return Mock(resolve=resolve)
+
+        monkeypatch.setattr(domain_collector_module, "DNS_RACE_NAMESERVERS", tuple(delays))
+        monkeypatch.setattr(domain_collector_module, "_NAMESERVER_LATENCY", {"10.0.0.4": 1.0})
+        monkeypatch.setattr(domain_collector_module, "_nameserver_resolver", resolver_for)
+
+        assert await domain_collector_module._resolve("example.com", "A") == "10.0.0.2"
+        await asyncio.sleep(0)
+        assert sorted(cancelled) == ["10.0.0.1", "10.0.0.3"]
+
+        # The known-slow nameserver sat out; every raced one is now measured
+        latency = domain_collector_module._NAMESERVER_LATENCY
+        assert latency["10.0.0.4"] == 1.0
+        assert all(latency[ns] < 1.0 for ns in ("10.0.0.1", "10.0.0.2", "10.0.0.3"))
+
+    @pytest.mark.asyncio
+    async def test_resolve_falls_back_when_all_nameservers_fail(self, monkeypatch):
+        """Test the system resolver answers when every raced nameserver fails."""
+
+        async def fail(domain, record_type, raise_on_no_answer=True):
+            raise dns.exception.Timeout()
+
+        monkeypatch.setattr(domain_collector_module, "DNS_RACE_NAMESERVERS", ("10.0.0.1", "10.0.0.2"))
+        monkeypatch.setattr(domain_collector_module, "_NAMESERVER_LATENCY", {})
+        monkeypatch.setattr(domain_collector_module, "_nameserver_resolver", lambda ns: Mock(resolve=fail))
+
+        with patch.object(get_shared_resolver(), "resolve", AsyncMock(return_value="system")):
+            assert await domain_collector_module._resolve("example.com", "A") == "system"
+
+    @pytest.mark.asyncio
+    async def test_whois_cached_per_domain(self, domain_collector):
+        """Test concurrent and repeated lookups of a domain query WHOIS once."""
+        with patch("whois.whois", return_value=None) as mock_whois:
+            await asyncio.gather(*(domain_collector._whois_lookup("example.com") for _ in range(3)))
+            await domain_collector._whois_lookup("Example.com")
+
+        assert mock_whois.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_whois_runs_on_dedicated_pool_per_tld_limit(self, domain_collector):
+        """Test WHOIS uses its own threads and at most two lookups per TLD at once."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0, "threads": set()}
+
+        def lookup(domain):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                state["threads"].add(threading.current_thread().name)
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return None
+
+        with patch("whois.whois", side_effect=lookup):
+            await asyncio.gather(*(domain_collector._whois_lookup(f"site{i}.com") for i in range(6)))
+
+        assert state["peak"] == WHOIS_PER_TLD_CONCURRENCY
+        assert all(name.startswith("whois") for name in state["threads"])
+
+    @pytest.mark.asyncio
+    async def test_historical_data_queries_cdx_over_https(self, domain_collector):
+        """Test the CDX query goes straight to https with a short connect timeout."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            rows = [["urlkey", "timestamp"], ["com,example)/", "20240101000000"], ["com,example)/", "20190101000000"]]
+            return httpx.Response(200, json=rows)
+
+        domain_collector.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        entities = await domain_collector._get_historical_data("example.com")
+        await domain_collector.session.aclose()
+
+        assert requests[0].url.scheme == "https"
+        assert requests[0].extensions["timeout"]["connect"] == 5
+        metadata = entities[0]["metadata"]
+        assert metadata["years_with_data"] == ["2019", "2024"]
+        assert metadata["wayback_snapshots"] == 2
+        assert (metadata["oldest_snapshot"], metadata["newest_snapshot"]) == ("20190101000000", "20240101000000")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "domain,indicators",
+        [
+            ("example.com", []),
+            ("Promo.XYZ", ["suspicious_tld"]),
+            ("a1b2c3d4e5f6g7h8i9j0k1l2", ["random_pattern"]),
+        ],
+    )
+    async def test_check_reputation_indicators(self, domain_collector, domain, indicators):
+        """Test suspicious TLD and random-pattern heuristics."""
+        entities = await domain_collector._check_reputation(domain)
+        assert entities[0]["metadata"]["reputation_indicators"] == indicators
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "target",
+        ["example.com", "https://Example.com/path?q=1", "ftp://user:pw@example.com:21/", "example.com:8443"],
+    )
+    async def test_collect_strips_target_to_host(self, target):
+        """Test scheme, userinfo, port and path are dropped from the target."""
+        collector = DomainCollector(CollectorConfig(target=target, data_type=DataType.DOMAIN))
+        helpers = ("_whois_lookup", "_dns_lookups", "_get_historical_data", "_check_reputation")
+        mocks = {name: AsyncMock(return_value=[]) for name in helpers}
+
+        with patch.multiple(collector, **mocks):
+            await collector.collect()
+
+        for mock in mocks.values():
+            mock.assert_awaited_once_with("example.com")
+
+    @pytest.mark.parametrize(
+        "record,valid",
+        [
+            ({"entity_type": "DOMAIN", "value": "example.com"}, True),
+            ({"relationship_type": "RELATED_TO", "source": "a", "target": "b"}, True),
+            ({"entity_type": "DOMAIN"}, False),
+            ({"value": "example.com"}, False),
+        ],
+    )
+    def test_validate(self, domain_collector, record, valid):
+        """Test entities need a type and value; relationships are accepted as is."""
+        assert domain_collector.validate(record) is valid
+
     @pytest.mark.asyncio
     @patch("whois.whois")
     async def test_whois_lookup(self, mock_whois, domain_collector):
@@ -312,6 +686,15 @@ class TestEmailCollector:
         result = await email_collector.collect()
         assert isinstance(result, CollectionResult)
 
+    @pytest.mark.asyncio
+    async def test_verify_email_uses_shared_resolver(self, email_collector):
+        """Test the MX check awaits the shared async resolver."""
+        mx = AsyncMock(return_value=[Mock()])
+        with patch.object(get_shared_resolver(), "resolve", mx):
+            entities = await email_collector._verify_email("user@example.com")
+
+        mx.assert_awaited_once_with("example.com", "MX")
+        assert entities[0]["metadata"]["mx_records_exist"] is True
 
 # =============================================================================
 # IPCollector Tests
@@ -533,6 +916,295 @@ class TestDarkWebCollector:
         result = await darkweb_collector.collect()
         assert isinstance(result, CollectionResult)
 
+    @pytest.mark.asyncio
+    async def test_fetch_page_caps_body(self, darkweb_collector):
+        """Test onion page bodies are read up to MAX_PAGE_BYTES only."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"x" * 5000))
+        darkweb_collector.session = httpx.AsyncClient(transport=transport)
+
+        with patch("app.collectors.darkweb_collector.MAX_PAGE_BYTES", 1000):
+            page, encoding = await darkweb_collector._fetch_page("http://test.onion")
+
+        assert len(page) == 1000
+        assert encoding == "utf-8"
+        await darkweb_collector.session.aclose()
+
+    @pytest.mark.asyncio
+    async def test_probe_onion_falls_back_to_ranged_get(self, darkweb_collector):
+        """Test onions rejecting HEAD are probed with a small ranged GET."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.method == "HEAD":
+                return httpx.Response(405)
+            return httpx.Response(206, content=b"x")
+
+        darkweb_collector.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        assert await darkweb_collector._probe_onion("http://test.onion")
+        assert [r.method for r in requests] == ["HEAD", "GET"]
+        assert requests[1].headers["Range"] == "bytes=0-1023"
+        await darkweb_collector.session.aclose()
+
+    @pytest.mark.asyncio
+    async def test_extract_onion_data_skips_dead_onion(self, darkweb_collector):
+        """Test an onion failing the probe is never fetched in full, and stays skipped."""
+        _ONION_CACHE.clear()
+        darkweb_collector._probe_onion = AsyncMock(return_value=False)
+        darkweb_collector._fetch_page = AsyncMock()
+
+        assert await darkweb_collector._extract_onion_data("http://dead.onion") == []
+        assert await darkweb_collector._extract_onion_data("http://dead.onion") == []
+        darkweb_collector._fetch_page.assert_not_awaited()
+        darkweb_collector._probe_onion.assert_awaited_once()
+        _ONION_CACHE.clear()
+
+    @pytest.mark.asyncio
+    async def test_extract_onion_data_cached_per_site(self, darkweb_collector):
+        """Test an onion site is fetched once and summarized from the cache after."""
+        _ONION_CACHE.clear()
+        darkweb_collector._probe_onion = AsyncMock(return_value=True)
+        darkweb_collector._fetch_page = AsyncMock(return_value=(b"<title>Shop</title>", "utf-8"))
+
+        first = await darkweb_collector._extract_onion_data("http://shop.onion")
+        second = await darkweb_collector._extract_onion_data("http://shop.onion")
+
+        assert darkweb_collector._fetch_page.await_count == 1
+        assert first[0]["metadata"] == second[0]["metadata"]
+        assert first[0]["metadata"]["title"] == "Shop"
+        assert first[0]["metadata"] is not second[0]["metadata"]
+        _ONION_CACHE.clear()
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_accepts_any_2xx(self, darkweb_collector):
+        """Test non-200 success responses are read and errors rejected."""
+        statuses = {"/partial": 206, "/gone": 404}
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(statuses[request.url.path], content=b"body")
+        )
+        darkweb_collector.session = httpx.AsyncClient(transport=transport)
+
+        assert await darkweb_collector._fetch_page("http://test.onion/partial") == (b"body", "utf-8")
+        assert await darkweb_collector._fetch_page("http://test.onion/gone") is None
+        await darkweb_collector.session.aclose()
+
+    @pytest.mark.parametrize(
+        "target,query_type",
+        [("user@example.com", "email"), ("user@localhost", "username"), ("johndoe", "username")],
+    )
+    def test_query_type(self, target, query_type):
+        """Test dark web queries are classified with the shared target classifier."""
+        collector = DarkWebCollector(CollectorConfig(target=target, data_type=DataType.USERNAME))
+        assert collector._query_type == query_type
+
+    @pytest.mark.asyncio
+    async def test_tor_client_keeps_connections_alive(self, darkweb_collector):
+        """Test the pooled Tor client keeps idle SOCKS connections for reuse."""
+        darkweb_collector._probe_tor = AsyncMock(return_value=True)
+
+        assert await darkweb_collector._initialize_tor_session()
+
+        pool = darkweb_collector.session._transport_for_url(httpx.URL("http://x.onion"))._pool
+        assert pool._keepalive_expiry == TOR_KEEPALIVE_EXPIRY
+        await close_shared_clients()
+
+    @pytest.mark.asyncio
+    async def test_tor_session_released_after_collect(self, darkweb_collector):
+        """Test collect() and context manager exit both drop the Tor client."""
+
+        async def init_tor():
+            darkweb_collector.session = Mock()
+            return True
+
+        darkweb_collector.tor_available = True
+        darkweb_collector._initialize_tor_session = init_tor
+        darkweb_collector._check_dark_web_mentions = AsyncMock(return_value=[])
+
+        await darkweb_collector.collect()
+        assert darkweb_collector.session is None
+
+        async with darkweb_collector:
+            await init_tor()
+        assert darkweb_collector.session is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("circuit,expected", [("1", True), ("0", False)])
+    async def test_probe_tor_checks_circuit_on_control_port(self, circuit, expected):
+        """Test a listening SOCKS port only counts once Tor reports a circuit."""
+        writer = Mock(wait_closed=AsyncMock())
+        controller = MagicMock()
+        controller.__enter__.return_value.get_info.return_value = circuit
+        DarkWebCollector._tor_probe = None
+
+        with patch("asyncio.open_connection", AsyncMock(return_value=(Mock(), writer))), patch(
+            "stem.control.Controller.from_port", return_value=controller
+        ):
+            assert await DarkWebCollector._probe_tor() is expected
+        DarkWebCollector._tor_probe = None
+
+    def test_circuit_check_tolerates_missing_control_port(self):
+        """Test an unreachable control port leaves the SOCKS probe result standing."""
+        with patch("stem.control.Controller.from_port", side_effect=OSError("refused")):
+            assert _tor_circuit_established() is None
+
+    def test_isolated_proxy_url_is_stable_per_target(self):
+        """Test each target maps to a fixed SOCKS credential on the Tor proxy."""
+        first = _isolated_proxy_url("alice@example.com")
+        assert first == _isolated_proxy_url("alice@example.com")
+        assert first.startswith("socks5://reconvault")
+        assert first.endswith("@127.0.0.1:9050")
+        tags = {_isolated_proxy_url(f"user{i}") for i in range(200)}
+        assert 1 < len(tags) <= TOR_ISOLATION_SLOTS
+
+    def test_summarize_page(self, darkweb_collector):
+        """Test title, visible text and link count are extracted in one parse."""
+        page = (
+            b"<html><head><title>Market</title><script>var x = 1;</script></head>"
+            b"<body><p>Hello <b>world</b></p><a href='/a'>A</a><a>B</a></body></html>"
+        )
+        title, text, text_length, links_count = darkweb_collector._summarize_page(page)
+        assert title == "Market"
+        assert text == "Market Hello world A B"
+        assert text_length == len(text)
+        assert links_count == 1
+
+    def test_summarize_page_uses_response_charset(self, darkweb_collector):
+        """Test raw bodies are decoded with the charset they were served with."""
+        page = "<title>Café</title><p>naïve</p>".encode("latin-1")
+        title, text, _, _ = darkweb_collector._summarize_page(page, "iso-8859-1")
+        assert title == "Café"
+        assert text == "Café naïve"
+
+    def test_summarize_page_truncates_sample(self, darkweb_collector):
+        """Test only the head of long visible text is kept, but fully counted."""
+        words = [f"word{i}" for i in range(1000)]
+        page = ("<html><body>" + "".join(f"<p>{w}</p>" for w in words) + "</body></html>").encode()
+        _, text, text_length, _ = darkweb_collector._summarize_page(page)
+        full = " ".join(words)
+        assert text == full[:500]
+        assert text_length == len(full)
+
+    def test_extract_onion_links(self, darkweb_collector):
+        """Test unique .onion hrefs are harvested, in page order."""
+        html = (
+            b'<html><body><a href="http://abc.onion/page">1</a>'
+            b'<a href="https://example.com">2</a><a>3</a>'
+            b'<a href="http://xyz.onion">4</a>'
+            b"<a class='r' href='http://abc.onion/page'>5</a>"
+            b'<a href="http://abc.onion.example.com/">6</a>'
+            b'<a href="http://not-onion.com/a.onionx">7</a></body></html>'
+        )
+        assert darkweb_collector._extract_onion_links(html) == [
+            "http://abc.onion/page",
+            "http://xyz.onion",
+        ]
+
+    def test_extract_onion_links_bounded_on_unclosed_tags(self, darkweb_collector):
+        """Test a page of unclosed anchor tags is scanned in bounded time."""
+        page = b"<a " * 20000 + b'<a href="http://abc.onion">x</a>'
+        start = time.perf_counter()
+        links = darkweb_collector._extract_onion_links(page)
+        assert time.perf_counter() - start < 3
+        assert links == ["http://abc.onion"]
+
+    def test_extract_onion_links_stops_at_limit(self, darkweb_collector):
+        """Test onion link harvesting stops after the first unique links."""
+        html = "".join(f'<a href="http://site{i % 20}.onion">{i}</a>' for i in range(100)).encode()
+        links = darkweb_collector._extract_onion_links(html, limit=5)
+        assert links == [f"http://site{i}.onion" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_dark_web_mentions_single_relationship(self, darkweb_collector):
+        """Test links from all engines are merged into one COMPROMISED_BY edge."""
+        _SEARCH_CACHE.clear()
+        darkweb_collector._fetch_page = AsyncMock(
+            return_value=(b'<a href="http://abc.onion">1</a>', "utf-8")
+        )
+        darkweb_collector._extract_many = AsyncMock(return_value=[])
+        darkweb_collector.config.target = "user@example.com"
+
+        entities = await darkweb_collector._check_dark_web_mentions("user@example.com")
+
+        relationships = [e for e in entities if "relationship_type" in e]
+        assert len(relationships) == 1
+        assert relationships[0]["metadata"]["onion_links"] == ["http://abc.onion"]
+        assert relationships[0]["metadata"]["query_type"] == "email"
+        assert len(entities) == len(SEARCH_ENGINES) + 1
+        darkweb_collector._extract_many.assert_awaited_once_with(["http://abc.onion"])
+        _SEARCH_CACHE.clear()
+
+    @pytest.mark.asyncio
+    async def test_tor_requests_share_one_bound(self, darkweb_collector):
+        """Test Tor fetches from all collectors share the per-loop stream cap."""
+        running = peak = 0
+
+        async def handler(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return httpx.Response(200, content=b"ok")
+
+        darkweb_collector.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("app.collectors.darkweb_collector.TOR_MAX_STREAMS", 2):
+            await asyncio.gather(
+                *(darkweb_collector._fetch_page(f"http://s{i}.onion") for i in range(6))
+            )
+
+        assert peak == 2
+        await darkweb_collector.session.aclose()
+
+    @pytest.mark.asyncio
+    async def test_extract_many_bounds_concurrency(self, darkweb_collector):
+        """Test onion sites are extracted concurrently, a few at a time."""
+        running = peak = 0
+
+        async def extract(url):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [{"entity_type": "URL", "value": url}]
+
+        darkweb_collector._extract_onion_data = extract
+        urls = [f"http://site{i}.onion" for i in range(10)]
+
+        entities = await darkweb_collector._extract_many(urls)
+
+        assert [e["value"] for e in entities] == urls
+        assert peak == ONION_EXTRACT_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_search_query_is_url_escaped(self, darkweb_collector):
+        """Test search queries are escaped in the engine URL."""
+        _SEARCH_CACHE.clear()
+        darkweb_collector._fetch_page = AsyncMock(return_value=None)
+
+        await darkweb_collector._search_darkweb("a&b c+d")
+
+        urls = [call.args[0] for call in darkweb_collector._fetch_page.await_args_list]
+        assert "https://ahmia.fi/search/?q=a%26b+c%2Bd" in urls
+
+    @pytest.mark.asyncio
+    async def test_search_results_cached_per_query(self, darkweb_collector):
+        """Test a repeated dark web search is answered from the shared cache."""
+        _SEARCH_CACHE.clear()
+        darkweb_collector._fetch_page = AsyncMock(
+            return_value=(b'<a href="http://abc.onion">1</a>', "utf-8")
+        )
+
+        first, _ = await darkweb_collector._search_darkweb("Leak")
+        second, _ = await darkweb_collector._search_darkweb(" leak ")
+
+        assert darkweb_collector._fetch_page.await_count == len(SEARCH_ENGINES)
+        assert [e["metadata"]["engine"] for e in first] == list(SEARCH_ENGINES)
+        assert first[0]["metadata"]["onion_links_found"] == ["http://abc.onion"]
+        assert second[0]["metadata"]["onion_links_found"] == ["http://abc.onion"]
+        _SEARCH_CACHE.clear()
+
 
 # =============================================================================
 # GeoCollector Tests
@@ -673,3 +1345,51 @@ class TestDataValidation:
         assert "target" in relationship
         assert "type" in relationship
         assert 0.0 <= relationship["confidence"] <= 1.0
+
+
+# =============================================================================
+# Target Type Inference Tests
+# =============================================================================
+
+
+class TestInferDataType:
+    """Test target type inference."""
+
+    @pytest.mark.parametrize(
+        "target,expected",
+        [
+            ("user@example.com", DataType.EMAIL),
+            ("USER@EXAMPLE.COM", DataType.EMAIL),
+            ("93.184.216.34", DataType.IP),
+            ("255.255.255.255", DataType.IP),
+            ("https://example.com", DataType.URL),
+            ("example.com", DataType.DOMAIN),
+            ("GitHub.com/johndoe", DataType.SOCIAL_PROFILE),
+            ("johndoe", DataType.USERNAME),
+        ],
+    )
+    def test_infer_data_type(self, target, expected):
+        """Test common target shapes are classified."""
+        assert infer_data_type(target) == expected
+
+    def test_out_of_range_octets_are_not_ip(self):
+        """Test dotted quads with octets above 255 are not IPs."""
+        assert infer_data_type("999.1.1.1") != DataType.IP
+
+    def test_non_ascii_digits_are_not_ip(self):
+        """Test Unicode digits do not make a target an IP address."""
+        assert infer_data_type("١٢٧.٠.٠.١") != DataType.IP
+
+    def test_long_near_miss_email_is_rejected(self):
+        """Test over-long local parts do not match as email."""
+        assert infer_data_type("a" * 100 + "@example.com") != DataType.EMAIL
+
+    def test_infer_data_types_batch(self):
+        """Test batch inference preserves order."""
+        targets = ["user@example.com", "10.0.0.1", "http://example.com", "johndoe"]
+        assert infer_data_types(targets) == [
+            DataType.EMAIL,
+            DataType.IP,
+            DataType.URL,
+            DataType.USERNAME,
+        ]
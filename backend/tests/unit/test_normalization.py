@@ -11,6 +11,7 @@ Tests cover:
 """
 import pytest
 from datetime import datetime
+from unittest.mock import patch
 from app.services.normalization_service import NormalizationService
 from app.collectors.base_collector import DataType, RiskLevel
 
@@ -72,6 +73,19 @@ class TestEntityDeduplication:
         # Different types should not be deduplicated
         assert len(result) == 2
 
+    def test_deduplicate_merges_metadata_on_collision(self, normalization_service):
+        """Test that duplicate metadata is merged into the kept entity."""
+        entities = [
+            {"entity_type": "domain", "value": "example.com", "risk_level": "LOW", "metadata": {"a": 1, "b": 1}},
+            {"entity_type": "domain", "value": "example.com", "risk_level": "HIGH", "metadata": {"b": 2}},
+        ]
+        result = normalization_service.deduplicate_entities(entities)
+        assert len(result) == 1
+        assert result[0]["risk_level"] == "HIGH"
+        assert result[0]["metadata"] == {"a": 1, "b": 2}
+        # Inputs are left untouched
+        assert entities[1]["metadata"] == {"b": 2}
+
 
 class TestDataCleaning:
     """Tests for data cleaning."""
@@ -184,6 +198,36 @@ class TestEnrichmentPipeline:
         results = [normalization_service.enrich_entity(e) for e in entities]
         assert len(results) == 3
 
+    def test_enrich_entity_metadata_by_type(self, normalization_service):
+        """Test type-specific enrichment and a shared batch timestamp."""
+        normalized_at = "2024-01-01T00:00:00Z"
+        email = normalization_service.enrich_entity_metadata(
+            {"entity_type": "email", "value": "user@test.com"}, normalized_at
+        )
+        domain = normalization_service.enrich_entity_metadata(
+            {"entity_type": "domain", "value": "a.b.example.com"}, normalized_at
+        )
+        ip = normalization_service.enrich_entity_metadata(
+            {"entity_type": "ip", "value": "1.2.3.4"}
+        )
+
+        assert email["metadata"]["domain"] == "test.com"
+        assert domain["metadata"]["subdomain"] == "a.b"
+        assert email["metadata"]["normalized_at"] == normalized_at
+        assert ip["metadata"]["normalized_at"].endswith("Z")
+        assert set(ip["metadata"]) == {"normalized_at"}
+
+    def test_value_hash_is_case_insensitive_and_stable(self, normalization_service):
+        """Test value hashes ignore case and have a fixed width."""
+        upper = normalization_service.enrich_entity_metadata(
+            {"entity_type": "domain", "value": "Example.COM"}
+        )
+        lower = normalization_service.enrich_entity_metadata(
+            {"entity_type": "domain", "value": "example.com"}
+        )
+        assert upper["value_hash"] == lower["value_hash"]
+        assert len(upper["value_hash"]) == 32
+
 
 class TestConfidenceCalculation:
     """Tests for confidence score calculation."""
@@ -380,6 +424,22 @@ class TestBatchProcessing:
         result = normalization_service.process_batch(entities)
         assert len(result) == 3
 
+    @pytest.mark.asyncio
+    async def test_batch_normalize_skips_deduplication(self, normalization_service):
+        """Test already deduplicated input is not deduplicated again."""
+        entities = [
+            {
+                "entity_type": "domain",
+                "value": "example.com",
+                "source": "DomainCollector",
+                "risk_level": "INFO",
+                "metadata": {},
+            }
+        ]
+        with patch.object(normalization_service, "deduplicate_entities") as mock_dedup:
+            await normalization_service.batch_normalize(entities, deduplicate=False)
+        mock_dedup.assert_not_called()
+
 
 class TestDataValidation:
     """Tests for data validation."""
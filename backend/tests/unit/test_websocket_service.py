@@ -0,0 +1,30 @@
+"""
+Unit tests for the WebSocket service.
+
+Tests cover:
+- Message serialization
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services import websocket_service
+
+
+class TestMessageSerialization:
+    """Tests for WebSocket message serialization."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_formats_datetimes_like_stdlib(self, monkeypatch, use_orjson):
+        """Test datetimes are encoded the same with and without orjson."""
+        if use_orjson and not websocket_service.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(websocket_service, "ORJSON_AVAILABLE", use_orjson)
+
+        message = {"type": "entity", "data": {"value": "example.com", "seen": datetime(2024, 1, 2, 3, 4, 5)}}
+
+        assert json.loads(websocket_service._dumps(message)) == {
+            "type": "entity",
+            "data": {"value": "example.com", "seen": "2024-01-02 03:04:05"},
+        }